@@ -2,6 +2,6 @@
 Configuration package for gradient descent research project.
 """
 
-from .settings import EXPERIMENT_CONFIG, OPTIMIZER_CONFIGS, PLOT_CONFIG, PATHS
+from .settings import EXPERIMENT_CONFIG, OPTIMIZER_CONFIGS, SWEEP_CONFIG, PLOT_CONFIG, PATHS
 
-__all__ = ['EXPERIMENT_CONFIG', 'OPTIMIZER_CONFIGS', 'PLOT_CONFIG', 'PATHS']
+__all__ = ['EXPERIMENT_CONFIG', 'OPTIMIZER_CONFIGS', 'SWEEP_CONFIG', 'PLOT_CONFIG', 'PATHS']
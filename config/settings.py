@@ -5,6 +5,38 @@ EXPERIMENT_CONFIG = {
     'random_seed': 42,
     'test_size': 0.2,
     'epochs': 30,
+    'batch_size': 1,  # 1 = true per-sample SGD
+    'backend': 'numpy',  # 'numba' JIT-compiles per-sample epochs when installed
+    'dtype': 'float64',  # 'float32' halves memory and speeds up BLAS
+    # Cost history tracking: 'full', 'every' (cost_every), 'subsample'
+    # (cost_sample_size rows) or 'running' (mean loss seen during the epoch)
+    'cost_tracking': {
+        'cost_mode': 'full',
+        'cost_every': 1,
+        'cost_sample_size': 1000
+    },
+    # Early stopping (None disables a criterion); patience monitors the
+    # cost on the test split
+    'early_stopping': {
+        'tol': None,
+        'grad_tol': None,
+        'patience': None,
+        'max_time': None
+    },
+    # On-disk cache of finished runs (see PATHS['cache_dir'])
+    'result_cache': {
+        'enabled': True,
+        'max_mb': 256
+    },
+    'cache_prepared_data': True,  # Reuse the split arrays via memory maps
+    # Live metrics (see PATHS['metrics_dir']): JSONL records per epoch and
+    # run, and Prometheus gauges in a file and optionally on an HTTP port
+    'metrics': {
+        'enabled': False,
+        'jsonl': True,
+        'prometheus': True,
+        'prometheus_port': None  # e.g. 9108 to serve /metrics
+    },
     'dataset': 'iris',
     'classes': ['Versicolor', 'Virginia']  # Binary classification
 }
@@ -35,6 +67,36 @@ OPTIMIZER_CONFIGS = {
     }
 }
 
+# Hyperparameter sweep (successive halving / Hyperband). Search spaces
+# are keyed by experiment optimizer name; a list is a set of choices and
+# ('log', low, high) / ('uniform', low, high) are continuous ranges
+SWEEP_CONFIG = {
+    'enabled': False,
+    'method': 'hyperband',  # or 'halving'
+    'max_epochs': 27,
+    'min_epochs': 1,
+    'eta': 3,
+    'n_configs': 27,  # configurations for 'halving'
+    'spaces': {
+        'SGD': {
+            'learning_rate': ('log', 1e-3, 1.0)
+        },
+        'SGD + Momentum': {
+            'learning_rate': ('log', 1e-3, 0.5),
+            'momentum': [0.5, 0.8, 0.9, 0.95, 0.99]
+        },
+        'RMSProp': {
+            'learning_rate': ('log', 1e-4, 0.5),
+            'rho': [0.8, 0.9, 0.95, 0.99]
+        },
+        'Adam': {
+            'learning_rate': ('log', 1e-4, 0.5),
+            'beta1': [0.8, 0.9, 0.95],
+            'beta2': [0.99, 0.999, 0.9999]
+        }
+    }
+}
+
 # Plotting configurations
 PLOT_CONFIG = {
     'figsize': (10, 6),
@@ -53,5 +115,9 @@ PATHS = {
     'docs_dir': '../docs',
     'figures_dir': '../results/figures',
     'data_dir': '../data',
+    'cache_dir': '../results/cache',
+    'prepared_data_dir': '../data/prepared',
+    'metrics_dir': '../results/metrics',
+    'results_store': '../results/store',
     'latex_main': '../docs/main.tex'
 }
@@ -11,8 +11,9 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root / 'src'))
 
 from src.experiment import GradientDescentExperiment
-from src.utils import plot_convergence_curves, save_results_to_file
-from config import EXPERIMENT_CONFIG, PLOT_CONFIG, PATHS
+from src.utils import (render_convergence, ResultCache, ResultStore,
+                       MetricsExporter, JSONLSink, PrometheusSink)
+from config import EXPERIMENT_CONFIG, SWEEP_CONFIG, PLOT_CONFIG, PATHS
 
 
 def main():
@@ -26,17 +27,60 @@ def main():
     results_dir.mkdir(exist_ok=True)
     figures_dir.mkdir(exist_ok=True)
     
+    # Finished runs are reused while their inputs are unchanged
+    result_cache = None
+    if EXPERIMENT_CONFIG['result_cache']['enabled']:
+        result_cache = ResultCache(PATHS['cache_dir'],
+                                   max_bytes=EXPERIMENT_CONFIG['result_cache']['max_mb'] * 2 ** 20)
+    
+    # Epoch and run metrics are written in the background while training
+    metrics = None
+    metrics_config = EXPERIMENT_CONFIG['metrics']
+    if metrics_config['enabled']:
+        metrics_dir = Path(PATHS['metrics_dir'])
+        sinks = []
+        if metrics_config['jsonl']:
+            sinks.append(JSONLSink(str(metrics_dir / "metrics.jsonl")))
+        if metrics_config['prometheus']:
+            sinks.append(PrometheusSink(str(metrics_dir / "metrics.prom"),
+                                        port=metrics_config['prometheus_port']))
+        metrics = MetricsExporter(sinks)
+    
     # Initialize and run experiment
     experiment = GradientDescentExperiment(
         epochs=EXPERIMENT_CONFIG['epochs'],
-        random_state=EXPERIMENT_CONFIG['random_seed']
+        random_state=EXPERIMENT_CONFIG['random_seed'],
+        batch_size=EXPERIMENT_CONFIG['batch_size'],
+        backend=EXPERIMENT_CONFIG['backend'],
+        fit_params={**EXPERIMENT_CONFIG['cost_tracking'],
+                    **EXPERIMENT_CONFIG['early_stopping']},
+        dtype=EXPERIMENT_CONFIG['dtype'],
+        result_cache=result_cache,
+        data_cache_dir=PATHS['prepared_data_dir'] if EXPERIMENT_CONFIG['cache_prepared_data'] else None,
+        metrics=metrics,
+        result_store=ResultStore(PATHS['results_store'])
     )
     
     print("📊 Preparando datos del dataset Iris...")
     experiment.prepare_data()
     
+    if SWEEP_CONFIG['enabled']:
+        print("🔎 Buscando hiperparámetros...")
+        experiment.run_sweep(
+            SWEEP_CONFIG['spaces'],
+            method=SWEEP_CONFIG['method'],
+            max_epochs=SWEEP_CONFIG['max_epochs'],
+            min_epochs=SWEEP_CONFIG['min_epochs'],
+            eta=SWEEP_CONFIG['eta'],
+            n_configs=SWEEP_CONFIG['n_configs']
+        )
+    
     print("🚀 Ejecutando optimizadores...")
-    experiment.run_optimizers()
+    try:
+        experiment.run_optimizers()
+    finally:
+        if metrics is not None:
+            metrics.close()
     
     print("📈 Generando visualizaciones...")
     # Generate plots
@@ -44,34 +88,18 @@ def main():
     pdf_path = figures_dir / "convergencia_optimizadores.pdf"
     latex_pdf_path = Path(PATHS['docs_dir']) / "curvas_convergencia.pdf"
     
-    # Create plots
-    plot_convergence_curves(
-        experiment.costs_dict,
-        save_path=str(png_path),
-        title="Convergencia de Métodos de Optimización - Dataset Iris"
-    )
-    
-    plot_convergence_curves(
-        experiment.costs_dict,
-        save_path=str(pdf_path),
-        title="Convergencia de Métodos de Optimización - Dataset Iris"
-    )
-    
-    # Copy PDF for LaTeX
-    plot_convergence_curves(
-        experiment.costs_dict,
-        save_path=str(latex_pdf_path),
-        title="Convergencia de Métodos de Optimización - Dataset Iris"
-    )
-    
-    print("💾 Guardando resultados...")
-    # Save detailed results
-    results_file = results_dir / "experiment_results.txt"
-    save_results_to_file(
-        experiment.results,
-        experiment.costs_dict,
-        str(results_file)
-    )
+    # Build the figure once and save it to every destination (skipped
+    # when the cost histories have not changed since the last render)
+    rendered = render_convergence({
+        'costs': experiment.costs_dict,
+        'epochs': experiment.cost_epochs_dict,
+        'paths': [str(png_path), str(pdf_path), str(latex_pdf_path)],
+        'title': "Convergencia de Métodos de Optimización - Dataset Iris",
+        'figsize': PLOT_CONFIG['figsize'],
+        'dpi': PLOT_CONFIG['dpi']
+    })
+    if not rendered:
+        print("   - Gráficos sin cambios, no se regeneran")
     
     # Print summary
     print("\n📋 RESUMEN DE RESULTADOS")
@@ -82,7 +110,8 @@ def main():
               f"Precisión: {result['test_accuracy']:.2%}")
     
     print(f"\n✅ Experimento completado!")
-    print(f"📁 Resultados guardados en: {results_dir}")
+    print(f"📁 Resultados guardados en: {PATHS['results_store']} "
+          f"({len(experiment.result_store)} ejecuciones almacenadas)")
     print(f"🖼️  Gráficos generados en: {figures_dir}")
     print(f"📄 Gráfico LaTeX en: {latex_pdf_path}")
 
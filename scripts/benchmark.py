@@ -0,0 +1,220 @@
+"""
+Benchmark suite for the optimizer training loops.
+
+Measures steps/second, epochs/second and peak memory of SGD, SGD with
+momentum, RMSProp and Adam over a matrix of synthetic datasets
+(rows x features x density) and batch sizes, and writes the results as
+JSON. With ``--compare`` the run is checked against a stored baseline and
+the script exits with status 1 when a case regressed beyond the threshold.
+
+Usage:
+    python scripts/benchmark.py --output bench.json
+    python scripts/benchmark.py --quick --compare bench.json --threshold 0.1
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import product
+
+import numpy as np
+
+# Add src to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from optimizers import SGD, SGDMomentum, RMSProp, Adam
+from optimizers.data_source import sp
+
+OPTIMIZERS = {
+    'SGD': SGD,
+    'SGDMomentum': SGDMomentum,
+    'RMSProp': RMSProp,
+    'Adam': Adam
+}
+
+# Default and quick benchmark matrices
+MATRIX = {
+    'rows': [1000, 10000],
+    'features': [10, 100],
+    'density': [1.0, 0.05],
+    'batch_size': [1, 32]
+}
+QUICK_MATRIX = {
+    'rows': [1000],
+    'features': [10],
+    'density': [1.0],
+    'batch_size': [1, 32]
+}
+
+# Fields identifying a benchmark case
+CASE_FIELDS = ('optimizer', 'rows', 'features', 'density', 'batch_size', 'backend')
+
+
+def make_dataset(rows: int, features: int, density: float, seed: int = 0):
+    """
+    Build a synthetic, linearly separable-ish classification problem.
+
+    Features have a bias column; with ``density < 1`` the other columns
+    are mostly zero and the matrix is returned in CSR format when scipy
+    is available.
+    """
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, features))
+    if density < 1:
+        X *= rng.random((rows, features)) < density
+    X[:, 0] = 1.0
+    w_true = rng.normal(size=features)
+    y = (X.dot(w_true) + rng.normal(scale=0.5, size=rows) > 0).astype(np.float64)
+    if density < 1 and sp is not None:
+        X = sp.csr_matrix(X)
+    return X, y
+
+
+def run_case(name: str, X, y, batch_size: int, epochs: int, repeats: int,
+             backend: str) -> dict:
+    """
+    Time one optimizer on one dataset.
+
+    The fastest of ``repeats`` runs is reported; the cost is computed only
+    after the last epoch so that training dominates the timing. Peak
+    memory is the largest amount allocated through NumPy during a run.
+    """
+    rows = X.shape[0]
+    fit_params = dict(batch_size=batch_size, cost_mode='every', cost_every=epochs)
+    seconds = math.inf
+    for _ in range(repeats):
+        optimizer = OPTIMIZERS[name](backend=backend, seed=0)
+        start = time.perf_counter()
+        optimizer.optimize(X, y, epochs, **fit_params)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    OPTIMIZERS[name](backend=backend, seed=0).optimize(X, y, epochs, **fit_params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    steps = epochs * math.ceil(rows / batch_size)
+    return {
+        'seconds': seconds,
+        'epochs_per_sec': epochs / seconds,
+        'steps_per_sec': steps / seconds,
+        'peak_mem_bytes': peak
+    }
+
+
+def run_benchmarks(matrix: dict, optimizers: list, epochs: int, repeats: int,
+                   backend: str) -> dict:
+    """Run every case of the matrix and return the JSON report."""
+    results = []
+    for rows, features, density in product(matrix['rows'], matrix['features'],
+                                           matrix['density']):
+        X, y = make_dataset(rows, features, density)
+        for batch_size, name in product(matrix['batch_size'], optimizers):
+            case = {'optimizer': name, 'rows': rows, 'features': features,
+                    'density': density, 'batch_size': batch_size, 'backend': backend}
+            case.update(run_case(name, X, y, batch_size, epochs, repeats, backend))
+            results.append(case)
+            print(f"{name:<12} {rows:>7}x{features:<5} d={density:<5} b={batch_size:<4} "
+                  f"{case['steps_per_sec']:>12.0f} pasos/s "
+                  f"{case['epochs_per_sec']:>9.2f} épocas/s "
+                  f"{case['peak_mem_bytes'] / 2 ** 20:>8.2f} MiB")
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'epochs': epochs,
+            'repeats': repeats
+        },
+        'results': results
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """
+    List the cases that regressed against a baseline report.
+
+    A case regresses when its steps/second drops, or its peak memory
+    grows, by more than ``threshold`` (a fraction) relative to the
+    baseline. Cases missing from the baseline are ignored.
+    """
+    reference = {tuple(case[field] for field in CASE_FIELDS): case
+                 for case in baseline['results']}
+    regressions = []
+    for case in report['results']:
+        base = reference.get(tuple(case[field] for field in CASE_FIELDS))
+        if base is None:
+            continue
+        speed = case['steps_per_sec'] / base['steps_per_sec'] - 1
+        memory = case['peak_mem_bytes'] / max(base['peak_mem_bytes'], 1) - 1
+        if speed < -threshold or memory > threshold:
+            regressions.append({**{field: case[field] for field in CASE_FIELDS},
+                                'speed_change': speed, 'memory_change': memory})
+    return regressions
+
+
+def parse_list(text: str, kind=int) -> list:
+    """Parse a comma-separated list of numbers."""
+    return [kind(value) for value in text.split(',')]
+
+
+def main():
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark de los optimizadores")
+    parser.add_argument('--output', help="Archivo JSON de resultados")
+    parser.add_argument('--compare', help="Archivo JSON de referencia para detectar regresiones")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Regresión tolerada (fracción, por defecto 0.10)")
+    parser.add_argument('--quick', action='store_true', help="Matriz reducida")
+    parser.add_argument('--optimizers', default=','.join(OPTIMIZERS),
+                        help="Optimizadores separados por comas")
+    parser.add_argument('--rows', help="Filas separadas por comas")
+    parser.add_argument('--features', help="Características separadas por comas")
+    parser.add_argument('--density', help="Densidades separadas por comas")
+    parser.add_argument('--batch-size', help="Tamaños de lote separados por comas")
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--backend', default='numpy', choices=('numpy', 'numba'))
+    args = parser.parse_args()
+
+    matrix = dict(QUICK_MATRIX if args.quick else MATRIX)
+    for field, kind in (('rows', int), ('features', int), ('density', float),
+                        ('batch_size', int)):
+        value = getattr(args, field)
+        if value:
+            matrix[field] = parse_list(value, kind)
+    optimizers = args.optimizers.split(',')
+    unknown = set(optimizers) - set(OPTIMIZERS)
+    if unknown:
+        parser.error(f"optimizadores desconocidos: {sorted(unknown)}")
+
+    report = run_benchmarks(matrix, optimizers, args.epochs, args.repeats, args.backend)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResultados guardados en: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresiones (umbral {args.threshold:.0%}):")
+            for regression in regressions:
+                case = ' '.join(f"{field}={regression[field]}" for field in CASE_FIELDS)
+                print(f"  {case}: velocidad {regression['speed_change']:+.1%}, "
+                      f"memoria {regression['memory_change']:+.1%}")
+            sys.exit(1)
+        print("\nSin regresiones respecto a la referencia")
+
+
+if __name__ == "__main__":
+    main()
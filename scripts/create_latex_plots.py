@@ -6,20 +6,23 @@ import sys
 import os
 import numpy as np
 
-# Add src to Python path
+# Add src and the project root to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 # Import from src package
 from src.experiment import GradientDescentExperiment
-from src.utils import plot_convergence_curves
+from src.utils import render_convergence, ResultCache
+from config import PATHS, PLOT_CONFIG
 
 
 def create_latex_plots():
     """Create plots specifically formatted for LaTeX document."""
     print("Generando gráficos para documento LaTeX...\n")
     
-    # Run experiment to get data
-    experiment = GradientDescentExperiment(epochs=30, random_state=42)
+    # Run experiment to get data (loaded from the result cache when unchanged)
+    experiment = GradientDescentExperiment(epochs=30, random_state=42,
+                                           result_cache=ResultCache(PATHS['cache_dir']))
     experiment.prepare_data()
     experiment.run_optimizers()
     
@@ -27,15 +30,21 @@ def create_latex_plots():
     plots_dir = os.path.join("..", "docs")
     os.makedirs(plots_dir, exist_ok=True)
     
-    # Generate LaTeX-compatible PDF plot
+    # Generate LaTeX-compatible PDF plot (kept when the data is unchanged)
     pdf_path = os.path.join(plots_dir, "curvas_convergencia.pdf")
-    plot_convergence_curves(
-        experiment.costs_dict, 
-        save_path=pdf_path,
-        title="Convergencia de Métodos de Optimización - Dataset Iris"
-    )
+    rendered = render_convergence({
+        'costs': experiment.costs_dict,
+        'epochs': experiment.cost_epochs_dict,
+        'paths': [pdf_path],
+        'title': "Convergencia de Métodos de Optimización - Dataset Iris",
+        'figsize': PLOT_CONFIG['figsize'],
+        'dpi': PLOT_CONFIG['dpi']
+    })
     
-    print(f"Gráfico PDF para LaTeX guardado en: {pdf_path}")
+    if rendered:
+        print(f"Gráfico PDF para LaTeX guardado en: {pdf_path}")
+    else:
+        print(f"Gráfico PDF para LaTeX sin cambios: {pdf_path}")
     print("¡Listo para incluir en el documento LaTeX!")
 
 
@@ -28,6 +28,7 @@ def main():
         print("  experiment  - Ejecutar experimento completo")
         print("  plots       - Generar solo gráficos")
         print("  latex       - Compilar documento LaTeX")
+        print("  bench       - Ejecutar benchmarks de rendimiento")
         print("  clean       - Limpiar archivos temporales")
         print("  all         - Ejecutar todo el pipeline")
         return
@@ -59,6 +60,12 @@ def main():
             "Compilando documento LaTeX"
         )
     
+    elif command == "bench":
+        run_command(
+            "python scripts/benchmark.py --output results/benchmark.json",
+            "Ejecutando benchmarks de rendimiento"
+        )
+    
     elif command == "clean":
         print("🧹 Limpiando archivos temporales...")
         
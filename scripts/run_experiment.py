@@ -5,10 +5,13 @@ Script to run the complete gradient descent experiment.
 import sys
 import os
 
-# Add src to Python path
+# Add src and the project root to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.experiment import GradientDescentExperiment
+from src.utils import ResultCache, ResultStore
+from config import PATHS
 
 
 def main():
@@ -16,7 +19,9 @@ def main():
     print("Iniciando experimento de optimización de descenso de gradiente...\n")
     
     # Create and run experiment
-    experiment = GradientDescentExperiment(epochs=30, random_state=42)
+    experiment = GradientDescentExperiment(epochs=30, random_state=42,
+                                           result_cache=ResultCache(PATHS['cache_dir']),
+                                           result_store=ResultStore(PATHS['results_store']))
     results, costs = experiment.run_full_experiment()
     
     print("\n¡Experimento completado exitosamente!")
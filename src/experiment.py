@@ -2,17 +2,22 @@
 Main experiment runner for gradient descent optimization comparison.
 """
 
+import asyncio
+import math
 import numpy as np
 import sys
 import os
-from typing import Dict, List, Tuple
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from optimizers import SGD, SGDMomentum, RMSProp, Adam
-from utils import (prepare_iris_data, split_data, plot_convergence_curves, 
-                   create_results_table, save_results_to_file)
+from utils import (prepare_split_data, render_many, create_results_table, run_parallel, StreamingPipeline,
+                   array_batches, ResultCache, ResultStore, MetricsExporter,
+                   MetricsCallback, peak_memory_bytes)
+from sweep import SweepRunner, sample_config
 
 
 class GradientDescentExperiment:
@@ -20,58 +25,212 @@ class GradientDescentExperiment:
     Main experiment class for comparing gradient descent optimizers.
     """
     
-    def __init__(self, epochs: int = 30, random_state: int = 42):
+    def __init__(self, epochs: int = 30, random_state: int = 42, batch_size: int = 1,
+                 backend: str = 'numpy', fit_params: Optional[Dict[str, Any]] = None,
+                 dtype: str = 'float64', result_cache: Optional[ResultCache] = None,
+                 data_cache_dir: Optional[str] = None,
+                 metrics: Optional[MetricsExporter] = None,
+                 result_store: Optional[ResultStore] = None):
         """
         Initialize the experiment.
         
         Args:
             epochs (int): Number of training epochs
             random_state (int): Random state for reproducibility
+            batch_size (int): Examples per optimizer update (1 = true SGD)
+            backend (str): Optimizer backend, 'numpy' or 'numba'
+            fit_params (Optional[Dict[str, Any]]): Extra keyword arguments for
+                every ``optimize`` call (e.g. ``cost_mode`` or the early
+                stopping criteria; with ``patience`` the test split is used
+                as validation data)
+            dtype (str): Precision of the prepared data and of training
+                ('float64' or 'float32')
+            result_cache (Optional[ResultCache]): Cache of finished runs;
+                runs whose inputs are unchanged are loaded instead of trained
+            data_cache_dir (Optional[str]): Cache directory for the prepared
+                and split data (memory-mapped on later runs)
+            metrics (Optional[MetricsExporter]): Destination of the epoch
+                and run metrics, written in the background while training
+            result_store (Optional[ResultStore]): Store every run trained by
+                this experiment is appended to (cache hits are not stored
+                again)
         """
         self.epochs = epochs
         self.random_state = random_state
+        self.batch_size = batch_size
+        self.fit_params = dict(fit_params or {})
+        self.dtype = np.dtype(dtype)
+        self.result_cache = result_cache
+        self.data_cache_dir = data_cache_dir
+        self.metrics = metrics
+        self.result_store = result_store
         self.optimizers = {
-            'SGD': SGD(learning_rate=0.05),
-            'SGD + Momentum': SGDMomentum(learning_rate=0.03, momentum=0.9),
-            'RMSProp': RMSProp(learning_rate=0.05, rho=0.9),
-            'Adam': Adam(learning_rate=0.05, beta1=0.9, beta2=0.999)
+            'SGD': SGD(learning_rate=0.05, backend=backend),
+            'SGD + Momentum': SGDMomentum(learning_rate=0.03, momentum=0.9, backend=backend),
+            'RMSProp': RMSProp(learning_rate=0.05, rho=0.9, backend=backend),
+            'Adam': Adam(learning_rate=0.05, beta1=0.9, beta2=0.999, backend=backend)
         }
         self.results = {}
         self.costs_dict = {}
+        self.cost_epochs_dict = {}
+        self.batched_results = {}
+        self.stream_losses = {}
+        self.sweep_results = {}
     
     def prepare_data(self) -> None:
         """Prepare and split the Iris dataset."""
         print("1. Preparando datos...")
         
-        # Prepare Iris data
-        X, y = prepare_iris_data()
-        
-        # Split into train/test
-        self.X_train, self.X_test, self.y_train, self.y_test = split_data(
-            X, y, test_size=0.2, random_state=self.random_state
+        # Prepare Iris data and split into train/test (cached when configured)
+        self.X_train, self.X_test, self.y_train, self.y_test = prepare_split_data(
+            test_size=0.2, random_state=self.random_state, dtype=self.dtype,
+            cache_dir=self.data_cache_dir
         )
         
         print(f"   - Datos de entrenamiento: {self.X_train.shape[0]} muestras")
         print(f"   - Datos de prueba: {self.X_test.shape[0]} muestras")
         print(f"   - Características: {self.X_train.shape[1] - 1} + bias\n")
     
+    def get_fit_params(self) -> Dict[str, Any]:
+        """
+        Return the keyword arguments for ``optimize``.
+        
+        Validation-based early stopping (``patience``) monitors the cost on
+        the test split.
+        
+        Returns:
+            Dict[str, Any]: ``fit_params`` plus validation data if needed
+        """
+        fit_params = dict(self.fit_params)
+        if fit_params.get('patience') is not None:
+            fit_params.update(X_val=self.X_test, y_val=self.y_test)
+        return fit_params
+    
+    def spawn_streams(self, seed: int) -> List[np.random.Generator]:
+        """
+        Spawn one independent random stream per optimizer from a seed.
+        
+        Args:
+            seed (int): Root seed of the run
+            
+        Returns:
+            List[np.random.Generator]: Streams in ``self.optimizers`` order
+        """
+        children = np.random.SeedSequence(seed).spawn(len(self.optimizers))
+        return [np.random.default_rng(child) for child in children]
+    
+    def result_key(self, name: str, optimizer: Any, seed: int) -> Optional[str]:
+        """
+        Return the cache key of one run, or None without a cache.
+        
+        Args:
+            name (str): Optimizer name in the experiment
+            optimizer (Any): Optimizer instance
+            seed (int): Root seed of the run
+            
+        Returns:
+            Optional[str]: Hash of the data, optimizer and training settings
+        """
+        if self.result_cache is None:
+            return None
+        return self.result_cache.key(
+            X_train=self.X_train, y_train=self.y_train,
+            X_test=self.X_test, y_test=self.y_test,
+            name=name, optimizer=type(optimizer).__name__, params=optimizer.get_params(),
+            epochs=self.epochs, seed=seed, batch_size=self.batch_size,
+            fit_params=self.fit_params, dtype=self.dtype.str
+        )
+    
+    def load_result(self, label: str, key: Optional[str], optimizer: Any) -> bool:
+        """
+        Fill ``results`` and ``costs_dict`` from the cache on a hit.
+        
+        Args:
+            label (str): Entry name in the results
+            key (Optional[str]): Cache key (None without a cache)
+            optimizer (Any): Optimizer stored with the result
+            
+        Returns:
+            bool: Whether the result was found
+        """
+        cached = self.result_cache.get(key) if key is not None else None
+        if cached is None:
+            return False
+        costs = cached.pop('costs').tolist()
+        self.results[label] = {**cached, 'optimizer': optimizer}
+        self.costs_dict[label] = costs
+        self.cost_epochs_dict[label] = cached.get('cost_epochs', list(range(1, len(costs) + 1)))
+        return True
+    
+    def store_result(self, label: str, key: Optional[str]) -> None:
+        """
+        Save a freshly trained result ``label`` to the cache and append it
+        to the result store (each is skipped when not configured).
+        """
+        if self.result_store is not None:
+            self.result_store.append([self.result_row(label)])
+        if key is None:
+            return
+        result = {name: value for name, value in self.results[label].items()
+                  if name != 'optimizer'}
+        self.result_cache.put(key, {**result, 'costs': np.asarray(self.costs_dict[label])})
+    
+    def emit_run(self, label: str, seconds: Optional[float] = None,
+                 cached: bool = False) -> None:
+        """
+        Export the metrics of the result ``label`` (no-op without metrics).
+        
+        Args:
+            label (str): Entry name in the results
+            seconds (Optional[float]): Training wall time
+            cached (bool): Whether the result came from the cache
+        """
+        if self.metrics is None:
+            return
+        result = self.results[label]
+        fields = {
+            'final_cost': float(result['final_cost']),
+            'train_accuracy': float(result['train_accuracy']),
+            'test_accuracy': float(result['test_accuracy']),
+            'epochs_run': result.get('epochs_run'),
+            'stop_reason': result.get('stop_reason'),
+            'cached': cached,
+            'peak_memory_bytes': peak_memory_bytes()
+        }
+        if seconds is not None:
+            steps = (result.get('epochs_run') or self.epochs) * math.ceil(
+                len(self.y_train) / self.batch_size)
+            fields.update(seconds=seconds, steps_per_sec=steps / seconds if seconds > 0 else None)
+        self.metrics.emit('run', label, **fields)
+    
     def run_optimizers(self) -> None:
         """Run all optimizers and collect results."""
         print("2. Entrenando modelos...")
         
-        # Set random seed for reproducibility
-        np.random.seed(self.random_state)
-        
-        for name, optimizer in self.optimizers.items():
+        streams = self.spawn_streams(self.random_state)
+        for (name, optimizer), stream in zip(self.optimizers.items(), streams):
+            key = self.result_key(name, optimizer, self.random_state)
+            if self.load_result(name, key, optimizer):
+                print(f"   - {name}: resultado en caché")
+                self.emit_run(name, cached=True)
+                continue
             print(f"   - Entrenando con {name}...")
             
-            # Reset random seed for fair comparison
-            np.random.seed(self.random_state)
+            # Each optimizer draws from its own child stream, so results do
+            # not depend on the order in which the optimizers run
+            optimizer.rng = stream
             
-            # Train the optimizer
+            # Train the optimizer (streaming epoch metrics when configured)
+            fit_params = self.get_fit_params()
+            if self.metrics is not None:
+                fit_params['callbacks'] = [*fit_params.get('callbacks', ()),
+                                           MetricsCallback(self.metrics, name)]
+            start = time.perf_counter()
             final_weights, cost_history = optimizer.optimize(
-                self.X_train, self.y_train, self.epochs
+                self.X_train, self.y_train, self.epochs, batch_size=self.batch_size,
+                **fit_params
             )
+            seconds = time.perf_counter() - start
             
             # Evaluate on train and test sets
             train_accuracy = optimizer.evaluate_accuracy(final_weights, self.X_train, self.y_train)
@@ -83,9 +242,255 @@ class GradientDescentExperiment:
                 'final_cost': cost_history[-1],
                 'train_accuracy': train_accuracy,
                 'test_accuracy': test_accuracy,
+                'epochs_run': optimizer.epochs_run,
+                'stop_reason': optimizer.stop_reason,
+                'seed': self.random_state,
+                'seconds': seconds,
+                'cost_epochs': optimizer.cost_epochs,
                 'optimizer': optimizer
             }
             self.costs_dict[name] = cost_history
+            self.cost_epochs_dict[name] = optimizer.cost_epochs
+            self.store_result(name, key)
+            self.emit_run(name, seconds)
+    
+    def run_optimizers_parallel(self, seeds: Optional[Sequence[int]] = None,
+                                max_workers: Optional[int] = None) -> None:
+        """
+        Run every (optimizer, seed) pair as a separate process-pool job.
+        
+        The training and test arrays are placed in shared memory once and
+        mapped by each worker. With the default single seed the results
+        match ``run_optimizers``; with several seeds each entry of
+        ``results`` and ``costs_dict`` is labelled with its seed. Each run
+        is reported, stored and its run metrics exported as soon as its job
+        finishes; the epoch metrics of the workers are not exported. The
+        entries are then put back in job order.
+        
+        Args:
+            seeds (Optional[Sequence[int]]): Seeds to run (defaults to random_state)
+            max_workers (Optional[int]): Number of worker processes
+        """
+        print("2. Entrenando modelos en paralelo...")
+        
+        seeds = [self.random_state] if seeds is None else list(seeds)
+        jobs = []
+        labels = []
+        keys = {}
+        job_seeds = {}
+        for seed in seeds:
+            streams = self.spawn_streams(seed)
+            for (name, optimizer), stream in zip(self.optimizers.items(), streams):
+                label = name if len(seeds) == 1 else f"{name} (semilla {seed})"
+                labels.append(label)
+                keys[label] = self.result_key(name, optimizer, seed)
+                job_seeds[label] = seed
+                if self.load_result(label, keys[label], optimizer):
+                    print(f"   - {label}: resultado en caché")
+                    self.emit_run(label, cached=True)
+                    continue
+                jobs.append({
+                    'label': label,
+                    'optimizer_class': type(optimizer),
+                    'params': optimizer.get_params(),
+                    'rng': stream,
+                    'epochs': self.epochs,
+                    'batch_size': self.batch_size,
+                    'fit_params': self.fit_params
+                })
+        
+        arrays = {'X_train': self.X_train, 'y_train': self.y_train,
+                  'X_test': self.X_test, 'y_test': self.y_test}
+        for output in run_parallel(jobs, arrays, max_workers=max_workers) if jobs else []:
+            print(f"   - Completado {output['label']}")
+            self.results[output['label']] = {
+                'weights': output['weights'],
+                'final_cost': output['costs'][-1],
+                'train_accuracy': output['train_accuracy'],
+                'test_accuracy': output['test_accuracy'],
+                'epochs_run': output['optimizer'].epochs_run,
+                'stop_reason': output['optimizer'].stop_reason,
+                'seed': job_seeds[output['label']],
+                'seconds': output['seconds'],
+                'cost_epochs': output['optimizer'].cost_epochs,
+                'optimizer': output['optimizer']
+            }
+            self.costs_dict[output['label']] = output['costs']
+            self.cost_epochs_dict[output['label']] = output['optimizer'].cost_epochs
+            self.store_result(output['label'], keys[output['label']])
+            self.emit_run(output['label'], output['seconds'])
+        
+        # Jobs finish in any order; keep the entries in job order
+        for label in labels:
+            for entries in (self.results, self.costs_dict, self.cost_epochs_dict):
+                if label in entries:
+                    entries[label] = entries.pop(label)
+    
+    def run_optimizers_streaming(self, source: Optional[Any] = None, maxsize: int = 8) -> None:
+        """
+        Train every optimizer online from an asynchronous stream of batches.
+        
+        All optimizers consume the same stream through one
+        ``StreamingPipeline``; reading the next batches overlaps with the
+        updates. The loss of every batch is stored in ``stream_losses``.
+        
+        Args:
+            source (Optional[Any]): Async iterator of ``(X_batch, y_batch)``
+                pairs (defaults to one pass over the training split)
+            maxsize (int): Batches buffered between reading and training
+        """
+        print("2. Entrenando modelos en flujo continuo...")
+        
+        if source is None:
+            source = array_batches(self.X_train, self.y_train, self.batch_size)
+        streams = self.spawn_streams(self.random_state)
+        for optimizer, stream in zip(self.optimizers.values(), streams):
+            optimizer.rng = stream
+            optimizer.init(self.X_train.shape[1], self.dtype)
+        
+        pipeline = StreamingPipeline(self.optimizers, maxsize=maxsize)
+        self.stream_losses = asyncio.run(pipeline.run(source))
+        print(f"   - {pipeline.n_batches} lotes, {pipeline.n_samples} muestras")
+        
+        for name, optimizer in self.optimizers.items():
+            weights = optimizer.weights
+            self.results[name] = {
+                'weights': weights,
+                'final_cost': optimizer.compute_cost(weights, self.X_train, self.y_train),
+                'train_accuracy': optimizer.evaluate_accuracy(weights, self.X_train, self.y_train),
+                'test_accuracy': optimizer.evaluate_accuracy(weights, self.X_test, self.y_test),
+                'seed': self.random_state,
+                'optimizer': optimizer
+            }
+            self.emit_run(name)
+    
+    def run_batched(self, name: str, seeds: Sequence[int],
+                    **hyperparameters: Any) -> Dict[str, Any]:
+        """
+        Train many runs of one optimizer at once as a single weight matrix.
+        
+        Seeds and hyperparameters are broadcast against each other, so
+        ``run_batched('Adam', seeds=range(20))`` repeats the default
+        configuration over 20 seeds and ``run_batched('SGD', seeds=[42] * 3,
+        learning_rate=[0.01, 0.05, 0.1])`` sweeps the learning rate.
+        
+        Args:
+            name (str): Key of the optimizer in ``self.optimizers``
+            seeds (Sequence[int]): Random seed of each run
+            **hyperparameters: Per-run overrides of the optimizer arguments
+            
+        Returns:
+            Dict[str, Any]: Per-run seeds, hyperparameters, weights, costs
+            and accuracies
+        """
+        print(f"   - Entrenando {name} en modo por lotes...")
+        
+        base = self.optimizers[name]
+        values = np.broadcast_arrays(np.asarray(seeds), *[
+            np.asarray(value, dtype=float) for value in hyperparameters.values()
+        ])
+        seeds = values[0].tolist()
+        swept = dict(zip(hyperparameters, values[1:]))
+        optimizer = type(base)(**{**base.get_params(), **swept})
+        
+        weights, costs = optimizer.optimize_many(
+            self.X_train, self.y_train, self.epochs, seeds=seeds,
+            batch_size=self.batch_size
+        )
+        
+        result = {
+            'seeds': seeds,
+            'hyperparameters': swept,
+            'weights': weights,
+            'costs': costs,
+            'final_cost': costs[-1],
+            'train_accuracy': optimizer.evaluate_accuracy(weights, self.X_train, self.y_train),
+            'test_accuracy': optimizer.evaluate_accuracy(weights, self.X_test, self.y_test)
+        }
+        self.batched_results[name] = result
+        return result
+    
+    def run_sweep(self, spaces: Dict[str, Dict[str, Any]], method: str = 'hyperband',
+                  max_epochs: Optional[int] = None, min_epochs: int = 1, eta: int = 3,
+                  n_configs: int = 27, cache_dir: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Tune the optimizers and replace them with their best configuration.
+        
+        Configurations are scored by their cost on the test split. The
+        remaining arguments of each optimizer keep their current values.
+        
+        Args:
+            spaces (Dict[str, Dict[str, Any]]): Search space per optimizer name
+            method (str): 'hyperband' or 'halving' (successive halving)
+            max_epochs (Optional[int]): Most epochs per configuration
+                (defaults to the experiment epochs)
+            min_epochs (int): Epochs of the first rung
+            eta (int): Promotion factor
+            n_configs (int): Number of sampled configurations for 'halving'
+            cache_dir (Optional[str]): Directory for the run checkpoints
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Best result per optimizer
+        """
+        if method not in ('hyperband', 'halving'):
+            raise ValueError(f"method must be 'hyperband' or 'halving', got {method!r}")
+        print("2. Buscando hiperparámetros...")
+        
+        max_epochs = max_epochs or self.epochs
+        runner = SweepRunner(self.X_train, self.y_train, self.X_test, self.y_test,
+                             seed=self.random_state, batch_size=self.batch_size,
+                             fit_params=self.fit_params, cache_dir=cache_dir)
+        streams = self.spawn_streams(self.random_state)
+        for (name, optimizer), stream in zip(self.optimizers.items(), streams):
+            if name not in spaces:
+                continue
+            base = optimizer.get_params()
+            space = {**base, **spaces[name]}
+            space.pop('seed', None)
+            if method == 'hyperband':
+                results = runner.hyperband(type(optimizer), space, max_epochs, eta=eta,
+                                           min_epochs=min_epochs, rng=stream)
+            else:
+                configs = [sample_config(space, stream) for _ in range(n_configs)]
+                results = runner.successive_halving(type(optimizer), configs, min_epochs,
+                                                    max_epochs, eta=eta)
+            best = results[0]
+            self.sweep_results[name] = best
+            self.optimizers[name] = type(optimizer)(**{**best['params'], 'seed': base['seed']})
+            print(f"   - {name}: costo de validación {best['val_cost']:.4f} con "
+                  f"{ {key: best['params'][key] for key in spaces[name]} }")
+        
+        print(f"   - Épocas entrenadas en total: {runner.epochs_trained}")
+        return self.sweep_results
+    
+    def result_row(self, label: str) -> Dict[str, Any]:
+        """
+        Return the run ``label`` as a row of a ``ResultStore``.
+        
+        Args:
+            label (str): Entry name in the results
+            
+        Returns:
+            Dict[str, Any]: Metadata and full cost history of the run
+        """
+        result = self.results[label]
+        optimizer = result['optimizer']
+        return {
+            'optimizer': type(optimizer).__name__,
+            'label': label,
+            'config': optimizer.get_params(),
+            'seed': result.get('seed', self.random_state),
+            'epochs': self.epochs,
+            'epochs_run': result.get('epochs_run'),
+            'batch_size': self.batch_size,
+            'stop_reason': result.get('stop_reason'),
+            'final_cost': result['final_cost'],
+            'train_accuracy': result['train_accuracy'],
+            'test_accuracy': result['test_accuracy'],
+            'seconds': result.get('seconds'),
+            'costs': self.costs_dict.get(label, ()),
+            'cost_epochs': self.cost_epochs_dict.get(label)
+        }
     
     def display_results(self) -> None:
         """Display experiment results."""
@@ -93,7 +498,8 @@ class GradientDescentExperiment:
     
     def save_results(self, output_dir: str = "output") -> None:
         """
-        Save results and generate plots.
+        Generate the result plots (runs are stored as they are trained,
+        see ``result_store``).
         
         Args:
             output_dir (str): Directory to save outputs
@@ -104,17 +510,24 @@ class GradientDescentExperiment:
         figures_dir = os.path.join(output_dir, "figures")
         os.makedirs(figures_dir, exist_ok=True)
         
-        # Save convergence plot as PDF
-        pdf_path = os.path.join(figures_dir, "curvas_convergencia.pdf")
-        plot_convergence_curves(self.costs_dict, save_path=pdf_path)
-        
-        # Save convergence plot as PNG
-        png_path = os.path.join(figures_dir, "curvas_convergencia.png")
-        plot_convergence_curves(self.costs_dict, save_path=png_path)
-        
-        # Save detailed results to text file
-        results_path = os.path.join(output_dir, "experiment_results.txt")
-        save_results_to_file(self.results, self.costs_dict, results_path)
+        # Convergence plot as PDF and PNG, plus one plot per seed when
+        # several seeds were run, rendered in parallel and only if changed
+        jobs = [{'costs': self.costs_dict, 'epochs': self.cost_epochs_dict,
+                 'paths': [os.path.join(figures_dir, "curvas_convergencia.pdf"),
+                           os.path.join(figures_dir, "curvas_convergencia.png")]}]
+        seeds = sorted({result.get('seed', self.random_state) for result in self.results.values()})
+        if len(seeds) > 1:
+            for seed in seeds:
+                costs = {label: self.costs_dict[label] for label, result in self.results.items()
+                         if result.get('seed', self.random_state) == seed and label in self.costs_dict}
+                if costs:
+                    path = os.path.join(figures_dir, f"curvas_convergencia_semilla_{seed}.png")
+                    epochs = {label: self.cost_epochs_dict[label] for label in costs
+                              if label in self.cost_epochs_dict}
+                    jobs.append({'costs': costs, 'epochs': epochs, 'paths': [path],
+                                 'title': f"Convergencia de Métodos de Optimización - Semilla {seed}"})
+        rendered = render_many(jobs)
+        print(f"Gráficos generados: {sum(rendered)} (sin cambios: {len(rendered) - sum(rendered)})")
     
     def run_full_experiment(self) -> Tuple[Dict, Dict]:
         """
@@ -7,5 +7,23 @@ from .sgd import SGD
 from .momentum import SGDMomentum
 from .rmsprop import RMSProp
 from .adam import Adam
+from .data_source import DataSource, ArrayDataSource, MemmapDataSource, as_data_source
+from .checkpoint import save_checkpoint, load_checkpoint
+from .callbacks import Callback, PhaseTimer, ProfilerCapture
 
-__all__ = ['BaseOptimizer', 'SGD', 'SGDMomentum', 'RMSProp', 'Adam']
+__all__ = [
+    'BaseOptimizer',
+    'SGD',
+    'SGDMomentum',
+    'RMSProp',
+    'Adam',
+    'DataSource',
+    'ArrayDataSource',
+    'MemmapDataSource',
+    'as_data_source',
+    'save_checkpoint',
+    'load_checkpoint',
+    'Callback',
+    'PhaseTimer',
+    'ProfilerCapture'
+]
@@ -3,8 +3,9 @@ Adam optimizer implementation.
 """
 
 import numpy as np
-from typing import Tuple, List
+from typing import Any, Dict, Optional
 from .base_optimizer import BaseOptimizer
+from .kernels import adam_epoch
 
 
 class Adam(BaseOptimizer):
@@ -16,7 +17,9 @@ class Adam(BaseOptimizer):
     """
     
     def __init__(self, learning_rate: float = 0.05, beta1: float = 0.9, 
-                 beta2: float = 0.999, epsilon: float = 1e-8):
+                 beta2: float = 0.999, epsilon: float = 1e-8, backend: str = 'numpy',
+                 seed: Optional[int] = None, rng: Optional[np.random.Generator] = None,
+                 exact_catch_up: bool = False):
         """
         Initialize Adam optimizer.
         
@@ -25,65 +28,131 @@ class Adam(BaseOptimizer):
             beta1 (float): Exponential decay rate for first moment estimates (typically 0.9)
             beta2 (float): Exponential decay rate for second moment estimates (typically 0.999)
             epsilon (float): Small constant to prevent division by zero
+            backend (str): 'numpy', or 'numba' for compiled per-sample epochs
+            seed (Optional[int]): Seed for a private random stream
+            rng (Optional[np.random.Generator]): Random stream to use (overrides seed)
+            exact_catch_up (bool): Replay skipped steps in lazy and sparse
+                training so the weights match dense Adam (see ``catch_up``)
         """
-        super().__init__(learning_rate)
+        super().__init__(learning_rate, backend, seed, rng)
         self.beta1 = beta1
         self.beta2 = beta2
         self.epsilon = epsilon
+        self.exact_catch_up = exact_catch_up
         self.name = "Adam"
     
-    def optimize(self, X: np.ndarray, y: np.ndarray, epochs: int = 30) -> Tuple[np.ndarray, List[float]]:
+    def init_state(self, w: np.ndarray) -> Dict[str, Any]:
+        """Allocate both moment estimates, the time step and scratch buffers."""
+        return {
+            'm_moment': np.zeros_like(w),  # First moment estimate
+            'v_moment': np.zeros_like(w),  # Second moment estimate
+            't': 0,  # Time step counter
+            'm_hat': np.empty_like(w),
+            'update': np.empty_like(w)
+        }
+    
+    def update(self, w: np.ndarray, grad: np.ndarray, state: Dict[str, Any]) -> None:
         """
-        Optimize weights using Adam.
+        Apply the Adam update in place.
         
         Args:
-            X (np.ndarray): Training features (m x n)
-            y (np.ndarray): Training labels (m,)
-            epochs (int): Number of training epochs
-            
-        Returns:
-            Tuple[np.ndarray, List[float]]: Final weights and cost history
+            w (np.ndarray): Current weights, updated in place
+            grad (np.ndarray): Gradient for the current batch
+            state (Dict[str, Any]): Buffers created by ``init_state``
         """
-        m, n = X.shape
-        w = np.random.normal(0, 0.01, n)  # Small random initialization
-        m_moment = np.zeros(n)  # First moment estimate
-        v_moment = np.zeros(n)  # Second moment estimate
-        costs = []
-        t = 0  # Time step counter
+        m_moment, v_moment = state['m_moment'], state['v_moment']
+        m_hat, update = state['m_hat'], state['update']
+        state['t'] += 1  # Increment time step
+        t = state['t']
+        
+        # Update biased first moment estimate
+        m_moment *= self.beta1
+        np.multiply(grad, 1 - self.beta1, out=update)
+        m_moment += update
+        
+        # Update biased second moment estimate
+        v_moment *= self.beta2
+        np.multiply(grad, grad, out=update)
+        update *= 1 - self.beta2
+        v_moment += update
+        
+        # Compute bias-corrected moment estimates
+        np.divide(m_moment, 1 - self.beta1 ** t, out=m_hat)
+        np.divide(v_moment, 1 - self.beta2 ** t, out=update)
         
-        for epoch in range(epochs):
-            # Shuffle indices for each epoch
-            indices = np.random.permutation(m)
-            
-            # Update for each individual example
-            for i in indices:
-                t += 1  # Increment time step
-                
-                # Compute prediction for current example
-                z = X[i].dot(w)
-                h = self.sigmoid(z)
-                
-                # Compute gradient for current example
-                grad = (h - y[i]) * X[i]
-                
-                # Update biased first moment estimate
-                m_moment = self.beta1 * m_moment + (1 - self.beta1) * grad
-                
-                # Update biased second moment estimate
-                v_moment = self.beta2 * v_moment + (1 - self.beta2) * (grad ** 2)
-                
-                # Compute bias-corrected first moment estimate
-                m_hat = m_moment / (1 - self.beta1 ** t)
-                
-                # Compute bias-corrected second moment estimate
-                v_hat = v_moment / (1 - self.beta2 ** t)
-                
-                # Adam update
-                w = w - (self.learning_rate / (np.sqrt(v_hat) + self.epsilon)) * m_hat
-            
-            # Compute cost at end of epoch
-            cost = self.compute_cost(w, X, y)
-            costs.append(cost)
+        # Adam update: w -= learning_rate / (sqrt(v_hat) + epsilon) * m_hat
+        np.sqrt(update, out=update)
+        update += self.epsilon
+        np.divide(self.learning_rate, update, out=update)
+        update *= m_hat
+        w -= update
+    
+    def sparse_update(self, w: np.ndarray, cols: np.ndarray, grad: np.ndarray,
+                      state: Dict[str, Any]) -> None:
+        """Apply the Adam update to the columns ``cols`` only."""
+        m_moment, v_moment = state['m_moment'], state['v_moment']
+        state['t'] += 1  # Increment time step
+        t = state['t']
+        
+        m_cols = m_moment[cols] * self.beta1 + grad * (1 - self.beta1)
+        v_cols = v_moment[cols] * self.beta2 + (grad * grad) * (1 - self.beta2)
+        m_moment[cols] = m_cols
+        v_moment[cols] = v_cols
         
-        self.costs_history = costs
-        return w, costs
+        m_hat = m_cols / (1 - self.beta1 ** t)
+        v_hat = v_cols / (1 - self.beta2 ** t)
+        w[cols] -= (self.learning_rate / (np.sqrt(v_hat) + self.epsilon)) * m_hat
+    
+    def catch_up(self, w: np.ndarray, cols: np.ndarray, skipped: np.ndarray,
+                 state: Dict[str, Any]) -> None:
+        """
+        Apply skipped zero-gradient Adam steps to the moment estimates.
+        
+        Both moments decay exactly (``beta1^k`` and ``beta2^k``). The weight
+        drift that a stale first moment would cause on those steps has no
+        closed form and is not applied, as in the usual lazy/sparse Adam;
+        coordinates that are nonzero in every example are unaffected.
+        
+        With ``exact_catch_up`` the skipped steps are replayed instead, drift
+        included, and the weights match dense Adam. That costs one
+        vectorized step per skipped step of the longest gap, which on sparse
+        data is slower than dense training.
+        """
+        if self.exact_catch_up:
+            self._replay_skipped(w, cols, skipped, state)
+            return
+        state['m_moment'][cols] *= self.beta1 ** skipped
+        state['v_moment'][cols] *= self.beta2 ** skipped
+    
+    def _replay_skipped(self, w: np.ndarray, cols: np.ndarray, skipped: np.ndarray,
+                        state: Dict[str, Any]) -> None:
+        """Replay ``skipped[j]`` zero-gradient steps on column ``cols[j]``."""
+        # Longest gaps first, so the columns still replaying are a prefix
+        order = np.argsort(-skipped, kind='stable')
+        cols, skipped = cols[order], skipped[order]
+        m_moment = state['m_moment'][cols]
+        v_moment = state['v_moment'][cols]
+        w_cols = w[cols]
+        step = state['t'] - skipped  # Last update of each column
+        
+        for j in range(1, int(skipped.max(initial=0)) + 1):
+            k = np.count_nonzero(skipped >= j)
+            step[:k] += 1
+            m_moment[:k] *= self.beta1
+            v_moment[:k] *= self.beta2
+            m_hat = m_moment[:k] / (1 - self.beta1 ** step[:k])
+            v_hat = v_moment[:k] / (1 - self.beta2 ** step[:k])
+            w_cols[:k] -= (self.learning_rate / (np.sqrt(v_hat) + self.epsilon)) * m_hat
+        
+        state['m_moment'][cols] = m_moment
+        state['v_moment'][cols] = v_moment
+        w[cols] = w_cols
+    
+    def compiled_epoch(self, X: np.ndarray, y: np.ndarray, w: np.ndarray,
+                       indices: np.ndarray, state: Dict[str, Any],
+                       track_loss: bool = False) -> float:
+        """Run one per-sample Adam epoch with the numba kernel."""
+        state['t'], loss = adam_epoch(X, y, w, indices, self.learning_rate, self.beta1,
+                                      self.beta2, self.epsilon, state['m_moment'],
+                                      state['v_moment'], state['t'], track_loss)
+        return loss
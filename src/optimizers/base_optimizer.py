@@ -2,81 +2,1071 @@
 Base optimizer class for all gradient descent methods.
 """
 
+import bisect
+import inspect
+import os
+import time
+import warnings
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Tuple, List
+from numpy.typing import DTypeLike
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from .kernels import NUMBA_AVAILABLE
+from .data_source import DataSource, ArrayDataSource, as_data_source, issparse
+from .prefetch import BatchPrefetcher
+from .callbacks import Callback
+from .checkpoint import get_rng_state, set_rng_state, save_checkpoint, load_checkpoint
+
+BACKENDS = ('numpy', 'numba')
+COST_MODES = ('full', 'every', 'subsample', 'running')
+# Values of ``stop_reason`` after ``optimize``
+STOP_REASONS = ('max_epochs', 'tol', 'grad_tol', 'patience', 'max_time')
 
 
 class BaseOptimizer(ABC):
     """
     Abstract base class for all optimizers.
     
-    All optimizers should inherit from this class and implement the
-    optimize method.
+    The base class owns the training driver (shuffling, gradient
+    computation and cost tracking). Subclasses only implement the update
+    rule in ``update`` and allocate its buffers in ``init_state``; they may
+    also provide a compiled per-sample epoch in ``compiled_epoch``.
+    
+    Besides ``optimize``, the model can be trained online: ``init``
+    allocates the weights and state on the optimizer, and ``partial_fit``
+    (or ``step`` with an externally computed gradient) updates them in
+    place, one batch at a time.
+    
+    For sparse input, subclasses also implement ``sparse_update`` (the rule
+    restricted to the nonzero columns of a gradient) and ``catch_up``
+    (the closed form of k zero-gradient steps). The driver then touches
+    only the nonzero columns of each example and applies pending decay
+    to a coordinate lazily, the next time it is touched.
     """
     
-    def __init__(self, learning_rate: float = 0.01):
+    def __init__(self, learning_rate: float = 0.01, backend: str = 'numpy',
+                 seed: Optional[int] = None, rng: Optional[np.random.Generator] = None):
         """
         Initialize the optimizer.
         
         Args:
             learning_rate (float): The learning rate for the optimizer
+            backend (str): 'numpy', or 'numba' to JIT-compile per-sample epochs
+            seed (Optional[int]): Seed for a private random stream
+            rng (Optional[np.random.Generator]): Random stream to use (overrides seed)
+        
+        Without ``seed`` or ``rng`` the optimizer falls back to the global
+        ``np.random`` state, as in earlier versions.
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        if backend == 'numba' and not NUMBA_AVAILABLE:
+            warnings.warn("numba is not installed; falling back to the NumPy backend",
+                          RuntimeWarning, stacklevel=3)
+            backend = 'numpy'
+        if rng is None and seed is not None:
+            rng = np.random.default_rng(seed)
         self.learning_rate = learning_rate
+        self.backend = backend
+        self.seed = seed
+        self.rng = rng
         self.costs_history = []
+        self.weights = None
+        self.state = None
+    
+    def get_params(self) -> Dict[str, Any]:
+        """
+        Return the constructor arguments of this optimizer.
+        
+        The random stream itself is not a hyperparameter and is left out, so
+        optimizers rebuilt from these params never share a stream.
+        
+        Returns:
+            Dict[str, Any]: Hyperparameters keyed by ``__init__`` argument name
+        """
+        signature = inspect.signature(type(self).__init__)
+        return {name: getattr(self, name) for name in signature.parameters
+                if name not in ('self', 'rng')}
+    
+    def init_state(self, w: np.ndarray) -> Dict[str, Any]:
+        """
+        Allocate the optimizer state buffers for weights shaped like ``w``.
+        
+        ``w`` is a vector for a single run and an (n_features, K) matrix
+        when ``optimize_many`` trains K runs at once.
+        
+        Args:
+            w (np.ndarray): Initial weights
+            
+        Returns:
+            Dict[str, Any]: State passed to every call of ``update``
+        """
+        return {}
     
     @abstractmethod
-    def optimize(self, X: np.ndarray, y: np.ndarray, epochs: int = 30) -> Tuple[np.ndarray, List[float]]:
+    def update(self, w: np.ndarray, grad: np.ndarray, state: Dict[str, Any]) -> None:
+        """
+        Apply one update to ``w`` in place.
+        
+        Args:
+            w (np.ndarray): Current weights, updated in place
+            grad (np.ndarray): Gradient for the current batch
+            state (Dict[str, Any]): Buffers created by ``init_state``
+        """
+        pass
+    
+    def sparse_update(self, w: np.ndarray, cols: np.ndarray, grad: np.ndarray,
+                      state: Dict[str, Any]) -> None:
+        """
+        Apply one update to the coordinates ``cols`` of ``w`` in place.
+        
+        Every other coordinate has a zero gradient for this step; its
+        pending decay is applied later through ``catch_up``.
+        
+        Args:
+            w (np.ndarray): Current weights, updated in place
+            cols (np.ndarray): Columns with a nonzero gradient
+            grad (np.ndarray): Gradient values of those columns
+            state (Dict[str, Any]): Buffers created by ``init_state``
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support sparse updates")
+    
+    def catch_up(self, w: np.ndarray, cols: np.ndarray, skipped: np.ndarray,
+                 state: Dict[str, Any]) -> None:
+        """
+        Apply ``skipped[j]`` zero-gradient steps to coordinate ``cols[j]``.
+        
+        The default suits update rules that leave a coordinate unchanged
+        when its gradient is zero.
+        
+        Args:
+            w (np.ndarray): Current weights, updated in place
+            cols (np.ndarray): Columns to bring up to date
+            skipped (np.ndarray): Number of steps each column missed
+            state (Dict[str, Any]): Buffers created by ``init_state``
+        """
+        pass
+    
+    def init_lazy_state(self, w: np.ndarray) -> Dict[str, Any]:
+        """
+        Allocate the state for lazy updates: the usual buffers plus a step
+        clock and the step at which each coordinate was last brought up to
+        date.
+        
+        Args:
+            w (np.ndarray): Initial weights
+            
+        Returns:
+            Dict[str, Any]: State for ``lazy_step`` and ``flush``
+        """
+        state = self.init_state(w)
+        state['clock'] = 0
+        state['last'] = np.zeros(w.shape[0], dtype=np.int64)
+        return state
+    
+    def refresh(self, w: np.ndarray, cols: np.ndarray, state: Dict[str, Any]) -> None:
+        """
+        Apply the pending decay of ``cols`` so their weights are current.
+        
+        Args:
+            w (np.ndarray): Current weights, updated in place
+            cols (np.ndarray): Unique columns to bring up to date
+            state (Dict[str, Any]): State created by ``init_lazy_state``
+        """
+        last = state['last']
+        skipped = state['clock'] - last[cols]
+        if skipped.any():
+            self.catch_up(w, cols, skipped, state)
+            last[cols] = state['clock']
+    
+    def lazy_step(self, w: np.ndarray, cols: np.ndarray, grad: np.ndarray,
+                  state: Dict[str, Any]) -> None:
+        """
+        Advance one step touching only ``cols``.
+        
+        The columns must have been brought up to date with ``refresh``
+        before the gradient was computed.
+        
+        Args:
+            w (np.ndarray): Current weights, updated in place
+            cols (np.ndarray): Unique columns with a nonzero gradient
+            grad (np.ndarray): Gradient values of those columns
+            state (Dict[str, Any]): State created by ``init_lazy_state``
+        """
+        state['clock'] += 1
+        self.sparse_update(w, cols, grad, state)
+        state['last'][cols] = state['clock']
+    
+    def flush(self, w: np.ndarray, state: Dict[str, Any]) -> None:
+        """
+        Apply all pending decay so that ``w`` and the state are exact.
+        
+        Args:
+            w (np.ndarray): Current weights, updated in place
+            state (Dict[str, Any]): State created by ``init_lazy_state``
+        """
+        skipped = state['clock'] - state['last']
+        cols = np.flatnonzero(skipped)
+        if len(cols):
+            self.catch_up(w, cols, skipped[cols], state)
+        state['last'][:] = state['clock']
+    
+    def compiled_epoch(self, X: np.ndarray, y: np.ndarray, w: np.ndarray,
+                       indices: np.ndarray, state: Dict[str, Any],
+                       track_loss: bool = False) -> float:
+        """
+        Run one per-sample epoch with the numba kernel of this optimizer.
+        
+        Args:
+            X (np.ndarray): C-contiguous features in the training dtype
+            y (np.ndarray): Labels in the training dtype
+            w (np.ndarray): Current weights, updated in place
+            indices (np.ndarray): Shuffled sample order for the epoch
+            state (Dict[str, Any]): Buffers created by ``init_state``
+            track_loss (bool): Whether to accumulate the per-sample losses
+            
+        Returns:
+            float: Sum of the per-sample losses (0.0 unless ``track_loss``)
+        """
+        raise NotImplementedError(f"{type(self).__name__} has no compiled kernel")
+    
+    def init(self, n_features: int, dtype: DTypeLike = np.float64,
+             weights: Optional[Union[np.ndarray, str]] = None) -> np.ndarray:
+        """
+        Allocate the weights and optimizer state for online training.
+        
+        Args:
+            n_features (int): Number of features (including bias term)
+            dtype (DTypeLike): Training dtype
+            weights (Optional[Union[np.ndarray, str]]): Starting weights or
+                a checkpoint file to take them from (random by default)
+            
+        Returns:
+            np.ndarray: The weights, updated in place by later calls
+        """
+        if weights is None:
+            rng = self.rng if self.rng is not None else np.random
+            self.weights = rng.normal(0, 0.01, n_features).astype(dtype, copy=False)
+        else:
+            self.weights = self.load_weights(weights, n_features, dtype)
+        self.state = self.init_state(self.weights)
+        self._grad = np.empty_like(self.weights)
+        self._work = np.empty((2, 0), dtype=self.weights.dtype)
+        return self.weights
+    
+    def step(self, grad: np.ndarray) -> np.ndarray:
+        """
+        Apply one update with a given gradient to the stored weights.
+        
+        Args:
+            grad (np.ndarray): Gradient of the loss at the current weights
+            
+        Returns:
+            np.ndarray: The updated weights
+        """
+        if self.weights is None:
+            raise RuntimeError("call init() or partial_fit() before step()")
+        self.update(self.weights, grad, self.state)
+        return self.weights
+    
+    def partial_fit(self, X_batch: np.ndarray, y_batch: np.ndarray) -> float:
+        """
+        Update the stored weights with one batch of examples.
+        
+        The first call initializes the model when ``init`` was not called.
+        Buffers are reused across calls, so each update allocates nothing
+        beyond what the batch needs and memory stays constant over an
+        unbounded stream.
+        
+        Args:
+            X_batch (np.ndarray): Features (b x n), or one example (n,)
+            y_batch (np.ndarray): Labels (b,), or one label
+            
+        Returns:
+            float: Mean loss of the batch before the update
+        """
+        if not issparse(X_batch):
+            X_batch = np.asarray(X_batch)
+            if X_batch.ndim == 1:
+                X_batch = X_batch[None, :]
+        if self.weights is None:
+            dtype = X_batch.dtype if X_batch.dtype.kind == 'f' else np.float64
+            self.init(X_batch.shape[1], dtype)
+        # Batches are cast to the model dtype, as optimize does with its data
+        X_batch = X_batch.astype(self.weights.dtype, copy=False)
+        y_batch = np.atleast_1d(y_batch).astype(self.weights.dtype, copy=False)
+        m = X_batch.shape[0]
+        if self._work.shape[1] < m:
+            self._work = np.empty((2, m), dtype=self.weights.dtype)
+        loss, grad = self.loss_and_grad(self.weights, X_batch, y_batch,
+                                        out=self._grad, work=self._work[:, :m])
+        self.update(self.weights, grad, self.state)
+        return float(loss)
+    
+    def optimize(self, X: Union[np.ndarray, DataSource], y: Optional[np.ndarray] = None,
+                 epochs: int = 30,
+                 batch_size: int = 1, cost_mode: str = 'full', cost_every: int = 1,
+                 cost_sample_size: int = 1000, dtype: Optional[DTypeLike] = None,
+                 loss_dtype: Optional[DTypeLike] = None,
+                 lazy: bool = False, tol: Optional[float] = None,
+                 grad_tol: Optional[float] = None, X_val: Optional[np.ndarray] = None,
+                 y_val: Optional[np.ndarray] = None, patience: Optional[int] = None,
+                 max_time: Optional[float] = None, checkpoint_path: Optional[str] = None,
+                 checkpoint_every: int = 1, resume_from: Optional[str] = None,
+                 initial_weights: Optional[Union[np.ndarray, str]] = None,
+                 prefetch_rows: Optional[int] = None,
+                 callbacks: Optional[Sequence[Callback]] = None) -> Tuple[np.ndarray, List[float]]:
         """
         Optimize the weights using the specific algorithm.
         
+        The cost history is tracked according to ``cost_mode``:
+        
+        - 'full': cost over all of ``X`` after every epoch
+        - 'every': full cost every ``cost_every`` epochs and after the last
+          one (also when early stopping ends training)
+        - 'subsample': cost over a fixed subset of ``cost_sample_size`` rows
+        - 'running': mean of the per-sample losses computed during the pass
+          (reuses the predictions of the inner loop, so it is nearly free,
+          but it reflects the weights as they changed during the epoch)
+        
+        The epochs (1-based) at which a cost was recorded are stored in
+        ``self.cost_epochs``.
+        
+        Training runs in ``dtype``: features, labels, weights and every
+        optimizer state buffer use it, so float32 halves memory traffic.
+        ``loss_dtype`` optionally accumulates the cost in a wider type.
+        
+        ``X`` may also be a ``DataSource`` (with ``y=None``) such as a
+        ``MemmapDataSource`` for data larger than memory. Each epoch then
+        visits the chunks in shuffled order and shuffles the rows within
+        each chunk; full costs are accumulated chunk by chunk.
+        
+        A ``scipy.sparse`` matrix is trained with lazy sparse updates, so
+        the cost of a step scales with the nonzeros of the batch rather
+        than with the number of features. ``lazy=True`` applies the same
+        scheme to dense features, updating only the nonzero columns of each
+        batch; it pays off on wide data with many zeros.
+        
+        Training stops before ``epochs`` when one of the enabled criteria
+        is met, checked at the end of every epoch:
+        
+        - ``tol``: relative decrease of the recorded cost below ``tol``
+        - ``grad_tol``: norm of the full training gradient below ``grad_tol``
+        - ``patience``: no improvement of the cost on ``X_val``/``y_val``
+          for ``patience`` epochs; the weights and optimizer state of the
+          best validation epoch (``self.best_epoch``) are restored, and the
+          cost history is cut back to that epoch so that its last entry is
+          the cost of the returned weights
+        - ``max_time``: wall-clock training time above ``max_time`` seconds
+        
+        The criterion that ended training ('max_epochs' when none did) is
+        stored in ``self.stop_reason``, the number of epochs run in
+        ``self.epochs_run`` and the validation costs in ``self.val_costs``.
+        
+        With ``checkpoint_path`` the complete training state (weights,
+        optimizer buffers, cost history, early stopping progress and the
+        position of the random stream) is written every ``checkpoint_every``
+        epochs and when training ends. Calling ``optimize`` again with the
+        same arguments and ``resume_from`` set to that file continues the
+        run where it stopped, with the same result as an uninterrupted run.
+        ``initial_weights`` warm-starts from given weights (or from the
+        weights of a checkpoint file, possibly of another optimizer) instead
+        of drawing them at random.
+        
+        With ``prefetch_rows`` the shuffled rows of dense features are
+        gathered into contiguous blocks of that many rows (rounded up to a
+        multiple of ``batch_size``) by a background thread, overlapping the
+        random-access copy with training. The updates are the same as
+        without prefetching. The overlap needs a spare CPU core; on a
+        single core the extra thread only adds overhead.
+        
+        ``callbacks`` instrument the run (see ``optimizers.callbacks``):
+        their epoch hooks receive the wall time of the shuffle, training
+        and cost phases, and callbacks with ``step_every`` are called on
+        sampled updates with the gradient norm and timings.
+        
+        Args:
+            X (Union[np.ndarray, DataSource]): Training features (including
+                bias term; dense or scipy.sparse) or a data source
+            y (Optional[np.ndarray]): Training labels (None for a data source)
+            epochs (int): Number of training epochs
+            batch_size (int): Number of examples per update (1 = true SGD)
+            cost_mode (str): One of 'full', 'every', 'subsample' or 'running'
+            cost_every (int): Epoch interval for the 'every' mode
+            cost_sample_size (int): Number of rows for the 'subsample' mode
+            dtype (Optional[DTypeLike]): Training precision for arrays
+                (defaults to the floating dtype of X, or float64; a data
+                source brings its own dtype)
+            loss_dtype (Optional[DTypeLike]): Accumulation dtype for the cost
+            lazy (bool): Use lazy updates on dense features too
+            tol (Optional[float]): Relative cost improvement threshold
+            grad_tol (Optional[float]): Gradient norm threshold
+            X_val (Optional[np.ndarray]): Validation features for ``patience``
+            y_val (Optional[np.ndarray]): Validation labels for ``patience``
+            patience (Optional[int]): Epochs without validation improvement
+            max_time (Optional[float]): Training time budget in seconds
+            checkpoint_path (Optional[str]): File for periodic checkpoints
+            checkpoint_every (int): Epoch interval between checkpoints
+            resume_from (Optional[str]): Checkpoint file to continue from
+            initial_weights (Optional[Union[np.ndarray, str]]): Starting
+                weights or a checkpoint file to take them from
+            prefetch_rows (Optional[int]): Rows per prefetched block (None
+                disables prefetching)
+            callbacks (Optional[Sequence[Callback]]): Training hooks
+            
+        Returns:
+            Tuple[np.ndarray, List[float]]: Final weights and cost history
+        """
+        self.check_batch_size(batch_size)
+        if cost_mode not in COST_MODES:
+            raise ValueError(f"cost_mode must be one of {COST_MODES}, got {cost_mode!r}")
+        if patience is not None and (X_val is None or y_val is None):
+            raise ValueError("patience requires X_val and y_val")
+        if checkpoint_every < 1:
+            raise ValueError(f"checkpoint_every must be >= 1, got {checkpoint_every}")
+        start_time = time.perf_counter()
+        source = as_data_source(X, y, dtype)
+        m, n = source.shape
+        rng = self.rng if self.rng is not None else np.random
+        if initial_weights is None:
+            w = rng.normal(0, 0.01, n).astype(source.dtype, copy=False)  # Small random initialization
+        else:
+            w = self.load_weights(initial_weights, n, source.dtype)
+        sparse = isinstance(source, ArrayDataSource) and issparse(source.X)
+        lazy = lazy or sparse
+        state = self.init_lazy_state(w) if lazy else self.init_state(w)
+        grad = np.empty_like(w)
+        costs = []
+        cost_epochs = []
+        
+        # The compiled kernels only cover true per-sample SGD with eager updates
+        compiled = self.backend == 'numba' and batch_size == 1 and not lazy
+        
+        prefetcher = None
+        if prefetch_rows is not None:
+            if sparse:
+                raise TypeError("prefetch_rows requires dense features")
+            block_rows = -(-prefetch_rows // batch_size) * batch_size
+            prefetcher = BatchPrefetcher(n, block_rows, source.dtype)
+            block_order = np.arange(block_rows)
+        
+        if isinstance(source, ArrayDataSource):
+            X_full, y_full = source.X, source.y
+        else:
+            X_full, y_full = source, None
+        if cost_mode == 'subsample' and cost_sample_size < m:
+            # Fixed rows drawn from a separate stream, so the training
+            # trajectory is the same as in the other modes
+            rows = np.sort(np.random.default_rng(0).choice(m, cost_sample_size, replace=False))
+            X_cost, y_cost = source.take(rows)
+        else:
+            X_cost, y_cost = X_full, y_full
+        track_loss = cost_mode == 'running'
+        self.stop_reason = 'max_epochs'
+        self.val_costs = []
+        # Weights, state and epoch of the best validation cost
+        best_val, best, since_best = np.inf, None, 0
+        start_epoch = 0
+        if resume_from is not None:
+            progress = self._restore_checkpoint(resume_from, w, state, rng)
+            start_epoch = progress['epoch']
+            costs, cost_epochs = progress['costs'], progress['cost_epochs']
+            self.val_costs = progress['val_costs']
+            best_val, best, since_best = (progress['best_val'], progress['best'],
+                                          progress['since_best'])
+        self.epochs_run = saved_epoch = start_epoch
+        
+        callbacks = list(callbacks or ())
+        # Callbacks sampling updates switch to the instrumented loop
+        step_callbacks = [callback for callback in callbacks if callback.step_every]
+        hooked = bool(step_callbacks) and not (compiled or lazy)
+        step = 0
+        for callback in callbacks:
+            callback.on_train_start(self, {'epochs': epochs, 'samples': m, 'features': n,
+                                           'batch_size': batch_size, 'start_epoch': start_epoch})
+        
+        for epoch in range(start_epoch, epochs):
+            self.epochs_run = epoch + 1
+            for callback in callbacks:
+                callback.on_epoch_start(self, epoch + 1)
+            epoch_start = time.perf_counter()
+            shuffle_time = 0.0
+            loss_sum = 0.0
+            for X_chunk, y_chunk in source.chunks(rng):
+                # Shuffle indices for each epoch (within each chunk)
+                shuffle_start = time.perf_counter()
+                indices = rng.permutation(len(y_chunk))
+                shuffle_time += time.perf_counter() - shuffle_start
+                if prefetcher is None:
+                    parts = [(X_chunk, y_chunk, indices)]
+                else:
+                    # Contiguous blocks of the shuffled rows, trained in row order
+                    parts = ((X_block, y_block, None)
+                             for X_block, y_block in prefetcher.blocks(X_chunk, y_chunk, indices))
+                
+                for X_part, y_part, order in parts:
+                    if compiled:
+                        loss_sum += self.compiled_epoch(
+                            np.ascontiguousarray(X_part), y_part, w,
+                            block_order[:len(y_part)] if order is None else order,
+                            state, track_loss)
+                    elif lazy:
+                        loss_sum += self._run_lazy_epoch(
+                            X_part, y_part, w,
+                            block_order[:len(y_part)] if order is None else order,
+                            state, batch_size, track_loss)
+                    elif hooked:
+                        part_loss, step = self._run_hooked_epoch(
+                            X_part, y_part, w, order, state, grad, batch_size, track_loss,
+                            step_callbacks, step)
+                        loss_sum += part_loss
+                    else:
+                        loss_sum += self._run_epoch(X_part, y_part, w, order, state, grad,
+                                                    batch_size, track_loss)
+            
+            # Track cost at end of epoch
+            cost_start = time.perf_counter()
+            recorded = True
+            if track_loss:
+                costs.append(loss_sum / m)
+            elif cost_mode != 'every' or (epoch + 1) % cost_every == 0 or epoch == epochs - 1:
+                costs.append(self.compute_cost(w, X_cost, y_cost, loss_dtype))
+            else:
+                recorded = False
+            if recorded:
+                cost_epochs.append(epoch + 1)
+            if callbacks:
+                cost_end = time.perf_counter()
+                train_time = cost_start - epoch_start - shuffle_time
+                logs = {
+                    'cost': costs[-1] if recorded else None,
+                    'samples': m,
+                    'samples_per_sec': m / train_time if train_time > 0 else float('inf'),
+                    'times': {'shuffle': shuffle_time, 'train': train_time,
+                              'cost': cost_end - cost_start}
+                }
+                for callback in callbacks:
+                    callback.on_epoch_end(self, epoch + 1, logs)
+            
+            # Early stopping checks
+            if patience is not None:
+                val_cost = self.compute_cost(w, X_val, y_val, loss_dtype)
+                self.val_costs.append(val_cost)
+                if val_cost < best_val:
+                    best_val, since_best = val_cost, 0
+                    best = {'w': w.copy(), 'epoch': epoch + 1,
+                            'state': {key: value.copy() if isinstance(value, np.ndarray) else value
+                                      for key, value in state.items()}}
+                else:
+                    since_best += 1
+                    if since_best >= patience:
+                        self.stop_reason = 'patience'
+                        break
+            if tol is not None and recorded and len(costs) > 1:
+                previous = costs[-2]
+                if previous - costs[-1] < tol * abs(previous):
+                    self.stop_reason = 'tol'
+                    break
+            if (grad_tol is not None
+                    and np.linalg.norm(self.compute_full_gradient(w, X_full, y_full)) < grad_tol):
+                self.stop_reason = 'grad_tol'
+                break
+            if max_time is not None and time.perf_counter() - start_time > max_time:
+                self.stop_reason = 'max_time'
+                break
+            
+            if checkpoint_path is not None and (epoch + 1) % checkpoint_every == 0:
+                self._save_checkpoint(checkpoint_path, w, state, rng, costs, cost_epochs,
+                                      best_val, best, since_best)
+                saved_epoch = epoch + 1
+        
+        # Early stopping can end an epoch whose cost was not recorded
+        if self.epochs_run > start_epoch and (not cost_epochs
+                                              or cost_epochs[-1] != self.epochs_run):
+            costs.append(self.compute_cost(w, X_cost, y_cost, loss_dtype))
+            cost_epochs.append(self.epochs_run)
+        if checkpoint_path is not None and saved_epoch != self.epochs_run:
+            self._save_checkpoint(checkpoint_path, w, state, rng, costs, cost_epochs,
+                                  best_val, best, since_best)
+        self.best_epoch = None if best is None else best['epoch']
+        if self.stop_reason == 'patience':
+            w, state = best['w'], best['state']
+            # The history ends at the returned weights
+            del costs[bisect.bisect_right(cost_epochs, best['epoch']):]
+            del cost_epochs[len(costs):]
+            if not cost_epochs or cost_epochs[-1] != best['epoch']:
+                costs.append(self.compute_cost(w, X_cost, y_cost, loss_dtype))
+                cost_epochs.append(best['epoch'])
+        self.costs_history = costs
+        # Keep the trained model on the optimizer so partial_fit can continue it
+        self.weights, self.state = w, state
+        self._grad, self._work = grad, np.empty((2, 0), dtype=w.dtype)
+        self.cost_epochs = cost_epochs
+        for callback in callbacks:
+            callback.on_train_end(self, {'epochs_run': self.epochs_run,
+                                         'stop_reason': self.stop_reason,
+                                         'seconds': time.perf_counter() - start_time})
+        return w, costs
+    
+    def _save_checkpoint(self, path: str, w: np.ndarray, state: Dict[str, Any], rng: Any,
+                         costs: List[float], cost_epochs: List[int], best_val: float,
+                         best: Optional[Dict[str, Any]], since_best: int) -> None:
+        """Write the training state after ``self.epochs_run`` epochs."""
+        arrays = {
+            'w': w,
+            'costs': np.asarray(costs, dtype=np.float64),
+            'cost_epochs': np.asarray(cost_epochs, dtype=np.int64),
+            'val_costs': np.asarray(self.val_costs, dtype=np.float64)
+        }
+        arrays.update({f'state_{key}': np.asarray(value) for key, value in state.items()})
+        if best is not None:
+            arrays['best_w'] = best['w']
+            arrays.update({f'best_state_{key}': np.asarray(value)
+                           for key, value in best['state'].items()})
+        meta = {
+            'optimizer': type(self).__name__,
+            'epoch': self.epochs_run,
+            'stop_reason': self.stop_reason,
+            'best_val': float(best_val),
+            'best_epoch': None if best is None else best['epoch'],
+            'since_best': since_best,
+            'rng_state': get_rng_state(rng)
+        }
+        save_checkpoint(path, arrays, meta)
+    
+    def _restore_checkpoint(self, path: str, w: np.ndarray, state: Dict[str, Any],
+                            rng: Any) -> Dict[str, Any]:
+        """
+        Load a checkpoint into ``w``, ``state`` and ``rng`` in place.
+        
+        Returns:
+            Dict[str, Any]: Epoch, cost history and early stopping progress
+        """
+        arrays, meta = load_checkpoint(path)
+        if meta['optimizer'] != type(self).__name__:
+            raise ValueError(f"checkpoint of {meta['optimizer']} cannot resume "
+                             f"{type(self).__name__}")
+        if arrays['w'].shape != w.shape:
+            raise ValueError(f"checkpoint weights have shape {arrays['w'].shape}, "
+                             f"expected {w.shape}")
+        w[...] = arrays['w']
+        for key, value in state.items():
+            saved = arrays[f'state_{key}']
+            if isinstance(value, np.ndarray):
+                value[...] = saved
+            else:
+                state[key] = type(value)(saved.item())
+        set_rng_state(rng, meta['rng_state'])
+        best = None
+        if 'best_w' in arrays:
+            best = {'w': arrays['best_w'], 'epoch': meta['best_epoch'],
+                    'state': {key: (arrays[f'best_state_{key}'].copy()
+                                    if isinstance(value, np.ndarray)
+                                    else type(value)(arrays[f'best_state_{key}'].item()))
+                              for key, value in state.items()}}
+        return {
+            'epoch': meta['epoch'],
+            'costs': arrays['costs'].tolist(),
+            'cost_epochs': arrays['cost_epochs'].tolist(),
+            'val_costs': arrays['val_costs'].tolist(),
+            'best_val': meta['best_val'],
+            'best': best,
+            'since_best': meta['since_best']
+        }
+    
+    @staticmethod
+    def load_weights(weights: Union[np.ndarray, str], n_features: int,
+                     dtype: DTypeLike) -> np.ndarray:
+        """
+        Return a writable copy of starting weights for warm starts.
+        
+        Args:
+            weights (Union[np.ndarray, str]): Weights, or a checkpoint file
+                whose weights to use
+            n_features (int): Expected number of weights
+            dtype (DTypeLike): Training dtype
+            
+        Returns:
+            np.ndarray: Weights in the training dtype
+        """
+        if isinstance(weights, (str, os.PathLike)):
+            weights = load_checkpoint(weights)[0]['w']
+        w = np.array(weights, dtype=dtype)
+        if w.shape != (n_features,):
+            raise ValueError(f"initial weights have shape {w.shape}, expected ({n_features},)")
+        return w
+    
+    def _run_epoch(self, X: np.ndarray, y: np.ndarray, w: np.ndarray,
+                   indices: Optional[np.ndarray], state: Dict[str, Any], grad: np.ndarray,
+                   batch_size: int, track_loss: bool) -> float:
+        """
+        Run one NumPy epoch in the given order (row order when ``indices``
+        is None); returns the loss sum if tracked.
+        """
+        loss_sum = 0.0
+        if batch_size == 1:
+            # Update for each individual example
+            for i in (range(len(y)) if indices is None else indices):
+                x_i = X[i]
+                z = x_i.dot(w)
+                np.multiply(x_i, self.sigmoid(z) - y[i], out=grad)
+                self.update(w, grad, state)
+                if track_loss:
+                    loss_sum += float(self.sample_losses(z, y[i]))
+        else:
+            # Update for each mini-batch with the fused loss/gradient kernel
+            work = np.empty((2, batch_size), dtype=np.result_type(X.dtype, w.dtype))
+            for start in range(0, len(y), batch_size):
+                if indices is None:
+                    idx = slice(start, start + batch_size)  # Contiguous rows, no copy
+                else:
+                    idx = indices[start:start + batch_size]
+                y_batch = y[idx]
+                loss, _ = self.loss_and_grad(w, X[idx], y_batch, out=grad,
+                                             work=work[:, :len(y_batch)])
+                self.update(w, grad, state)
+                loss_sum += float(loss) * len(y_batch)
+        return loss_sum
+    
+    def _run_hooked_epoch(self, X: np.ndarray, y: np.ndarray, w: np.ndarray,
+                          indices: Optional[np.ndarray], state: Dict[str, Any],
+                          grad: np.ndarray, batch_size: int, track_loss: bool,
+                          callbacks: Sequence[Callback], step: int) -> Tuple[float, int]:
+        """
+        Run ``_run_epoch`` calling the ``on_step`` hooks of ``callbacks``.
+        
+        The updates are the same as in ``_run_epoch``; the gradient and the
+        update of every step are timed separately. Returns the loss sum and
+        the step count after the epoch.
+        """
+        loss_sum = 0.0
+        clock = time.perf_counter
+        work = np.empty((2, batch_size), dtype=np.result_type(X.dtype, w.dtype))
+        for start in range(0, len(y), batch_size):
+            grad_start = clock()
+            if batch_size == 1:
+                i = start if indices is None else indices[start]
+                x_i = X[i]
+                z = x_i.dot(w)
+                np.multiply(x_i, self.sigmoid(z) - y[i], out=grad)
+                if track_loss:
+                    loss_sum += float(self.sample_losses(z, y[i]))
+                rows = 1
+            else:
+                if indices is None:
+                    idx = slice(start, start + batch_size)
+                else:
+                    idx = indices[start:start + batch_size]
+                y_batch = y[idx]
+                loss, _ = self.loss_and_grad(w, X[idx], y_batch, out=grad,
+                                             work=work[:, :len(y_batch)])
+                loss_sum += float(loss) * len(y_batch)
+                rows = len(y_batch)
+            update_start = clock()
+            self.update(w, grad, state)
+            update_end = clock()
+            sampled = [callback for callback in callbacks if step % callback.step_every == 0]
+            if sampled:
+                logs = {'rows': rows, 'grad_norm': float(np.linalg.norm(grad)),
+                        'grad_time': update_start - grad_start,
+                        'update_time': update_end - update_start}
+                for callback in sampled:
+                    callback.on_step(self, step, logs)
+            step += 1
+        return loss_sum, step
+    
+    def _run_lazy_epoch(self, X: Any, y: np.ndarray, w: np.ndarray,
+                        indices: np.ndarray, state: Dict[str, Any],
+                        batch_size: int, track_loss: bool) -> float:
+        """Run one epoch with lazy updates (CSR or dense rows); returns the loss sum if tracked."""
+        loss_sum = 0.0
+        sparse = issparse(X)
+        for start in range(0, len(indices), batch_size):
+            idx = indices[start:start + batch_size]
+            if len(idx) == 1:
+                # Nonzeros of a single row
+                i = idx[0]
+                if sparse:
+                    cols = X.indices[X.indptr[i]:X.indptr[i + 1]]
+                    values = X.data[X.indptr[i]:X.indptr[i + 1]]
+                else:
+                    cols = np.flatnonzero(X[i])
+                    values = X[i, cols]
+                self.refresh(w, cols, state)
+                z = values.dot(w[cols])
+                grad = values * (self.sigmoid(z) - y[i])
+                if track_loss:
+                    loss_sum += float(self.sample_losses(z, y[i]))
+            elif sparse:
+                # Sum the batch gradient over the union of its columns
+                X_batch = X[idx]
+                cols, position = np.unique(X_batch.indices, return_inverse=True)
+                self.refresh(w, cols, state)
+                z = X_batch.dot(w)
+                residual = self.sigmoid(z) - y[idx]
+                weights = X_batch.data * np.repeat(residual, np.diff(X_batch.indptr))
+                grad = np.bincount(position, weights=weights, minlength=len(cols)) / len(idx)
+                if track_loss:
+                    loss_sum += float(self.sample_losses(z, y[idx]).sum())
+            else:
+                # Restrict the batch to the columns with any nonzero
+                X_batch = X[idx]
+                cols = np.flatnonzero(X_batch.any(axis=0))
+                X_batch = X_batch[:, cols]
+                self.refresh(w, cols, state)
+                z = X_batch.dot(w[cols])
+                grad = X_batch.T.dot(self.sigmoid(z) - y[idx]) / len(idx)
+                if track_loss:
+                    loss_sum += float(self.sample_losses(z, y[idx]).sum())
+            self.lazy_step(w, cols, grad, state)
+        
+        # Bring every coordinate up to date before the cost is computed
+        self.flush(w, state)
+        return loss_sum
+    
+    def optimize_many(self, X: np.ndarray, y: np.ndarray, epochs: int = 30,
+                      seeds: Sequence[int] = (42,),
+                      batch_size: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Train K independent runs together as one (n_features, K) weight matrix.
+        
+        Run k draws its initial weights and shuffle order from its own
+        Generator, so it follows the same trajectory as ``optimize`` with
+        ``seed=seeds[k]``. Hyperparameters may be given as arrays
+        of length K to give every run its own value; the update rules
+        broadcast them across the columns of the weight matrix.
+        
         Args:
             X (np.ndarray): Training features (including bias term)
             y (np.ndarray): Training labels
             epochs (int): Number of training epochs
+            seeds (Sequence[int]): One seed (or SeedSequence/Generator) per run
+            batch_size (int): Number of examples per update (1 = true SGD)
             
         Returns:
-            Tuple[np.ndarray, List[float]]: Final weights and cost history
+            Tuple[np.ndarray, np.ndarray]: Final weights (n_features x K) and
+            cost history (epochs x K)
         """
-        pass
+        self.check_batch_size(batch_size)
+        if issparse(X):
+            raise TypeError("optimize_many does not support sparse input")
+        X, y = self.cast_data(X, y)
+        m, n = X.shape
+        streams = [np.random.default_rng(seed) for seed in seeds]
+        W = np.stack([rs.normal(0, 0.01, n) for rs in streams], axis=1).astype(X.dtype, copy=False)
+        state = self.init_state(W)
+        grad = np.empty_like(W)
+        costs = []
+        
+        for epoch in range(epochs):
+            # Every run shuffles with its own stream: order is (K x m)
+            order = np.stack([rs.permutation(m) for rs in streams])
+            
+            for start in range(0, m, batch_size):
+                idx = order[:, start:start + batch_size]
+                X_batch = X[idx]  # (K x b x n)
+                z = np.matmul(X_batch, W.T[:, :, None])[:, :, 0]
+                residual = self.sigmoid(z) - y[idx]
+                np.divide(np.einsum('kbn,kb->nk', X_batch, residual), idx.shape[1], out=grad)
+                self.update(W, grad, state)
+            
+            # Compute the cost of every run at end of epoch
+            costs.append(self.compute_cost(W, X, y))
+        
+        costs = np.array(costs)
+        self.costs_history = costs
+        return W, costs
     
     def sigmoid(self, z: np.ndarray) -> np.ndarray:
         """Sigmoid activation function with overflow protection."""
         z = np.clip(z, -500, 500)
         return 1 / (1 + np.exp(-z))
     
-    def compute_cost(self, w: np.ndarray, X: np.ndarray, y: np.ndarray) -> float:
+    def sample_losses(self, z: np.ndarray, y: np.ndarray) -> np.ndarray:
         """
-        Compute the logistic regression cost (cross-entropy).
+        Cross-entropy of each example, computed stably from its logit.
+        
+        Args:
+            z (np.ndarray): Logits
+            y (np.ndarray): Labels
+            
+        Returns:
+            np.ndarray: Per-sample losses
+        """
+        return np.logaddexp(0, z) - y * z
+    
+    @staticmethod
+    def cast_data(X: np.ndarray, y: np.ndarray,
+                  dtype: Optional[DTypeLike] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bring features and labels to a common floating training dtype.
         
         Args:
-            w (np.ndarray): Current weights
             X (np.ndarray): Features
             y (np.ndarray): Labels
+            dtype (Optional[DTypeLike]): Target dtype (defaults to the
+                floating dtype of X, or float64)
             
         Returns:
-            float: The computed cost
+            Tuple[np.ndarray, np.ndarray]: Features and labels (no copy when
+            they already have the target dtype)
+        """
+        if dtype is None:
+            dtype = X.dtype if X.dtype.kind == 'f' else np.float64
+        return np.asarray(X, dtype=dtype), np.asarray(y, dtype=dtype)
+    
+    @staticmethod
+    def check_batch_size(batch_size: int) -> None:
+        """Validate the mini-batch size passed to ``optimize``."""
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    
+    def logits(self, w: np.ndarray, X: np.ndarray,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Compute the linear scores ``X . w``.
+        
+        Args:
+            w (np.ndarray): Weights (or n_features x K for K runs)
+            X (np.ndarray): Features (dense or scipy.sparse)
+            out (Optional[np.ndarray]): Preallocated C-contiguous buffer
+            
+        Returns:
+            np.ndarray: Logits (m,) or (m x K)
+        """
+        if out is None:
+            return X.dot(w)
+        if issparse(X):
+            out[...] = X.dot(w)
+            return out
+        return np.dot(X, w, out=out)
+    
+    def loss_and_grad(self, w: np.ndarray, X: np.ndarray, y: np.ndarray,
+                      out: Optional[np.ndarray] = None,
+                      work: Optional[np.ndarray] = None, with_grad: bool = True,
+                      loss_dtype: Optional[DTypeLike] = None) -> Tuple[float, Optional[np.ndarray]]:
+        """
+        Compute the mean cross-entropy and its gradient in one fused pass.
+        
+        The loss is evaluated from the logits with ``np.logaddexp`` as
+        ``(1 - y) * log(1 + e^z) + y * log(1 + e^-z)``, so both terms are
+        non-negative, nothing is clipped and there is no cancellation near
+        saturation. The residual ``sigmoid(z) - y`` is recovered from the
+        same intermediates as ``exp(z - log(1 + e^z)) - y``.
+        
+        Args:
+            w (np.ndarray): Current weights (or n_features x K for K runs)
+            X (np.ndarray): Features
+            y (np.ndarray): Labels
+            out (Optional[np.ndarray]): Preallocated buffer for the gradient
+            work (Optional[np.ndarray]): Preallocated (2, m) or (2, m, K)
+                scratch buffer for the logits and intermediates
+            with_grad (bool): Whether to compute the gradient
+            loss_dtype (Optional[DTypeLike]): Accumulate the loss in this dtype
+                (e.g. float64 for float32 training)
+            
+        Returns:
+            Tuple[float, Optional[np.ndarray]]: Mean loss (one per run for
+            2-D weights) and mean gradient (None without ``with_grad``)
         """
         m = len(y)
-        z = X.dot(w)
-        h = self.sigmoid(z)
-        # Avoid log(0)
-        h = np.clip(h, 1e-15, 1 - 1e-15)
-        cost = -(1/m) * (y.dot(np.log(h)) + (1 - y).dot(np.log(1 - h)))
+        if work is None:
+            work = np.empty((2,) + (m,) + w.shape[1:], dtype=np.result_type(X.dtype, w.dtype))
+        z, softplus = work[0], work[1]
+        
+        self.logits(w, X, out=z)
+        np.logaddexp(0, z, out=softplus)            # log(1 + e^z)
+        np.subtract(z, softplus, out=z)             # log(sigmoid(z)) = -log(1 + e^-z)
+        if loss_dtype is None:
+            loss = ((1 - y).dot(softplus) - y.dot(z)) / m
+        else:
+            loss = (np.einsum('i,i...->...', 1 - y, softplus, dtype=loss_dtype)
+                    - np.einsum('i,i...->...', y, z, dtype=loss_dtype)) / m
+        
+        if not with_grad:
+            return loss, None
+        
+        np.exp(z, out=z)                            # sigmoid(z)
+        z -= y[:, None] if w.ndim == 2 else y
+        if issparse(X):
+            grad = X.T.dot(z)
+            if out is not None:
+                out[...] = grad
+                grad = out
+        else:
+            grad = np.dot(X.T, z, out=out)
+        grad /= m
+        return loss, grad
+    
+    def compute_cost(self, w: np.ndarray, X: Union[np.ndarray, DataSource],
+                     y: Optional[np.ndarray] = None,
+                     loss_dtype: Optional[DTypeLike] = None) -> float:
+        """
+        Compute the logistic regression cost (cross-entropy).
+        
+        Args:
+            w (np.ndarray): Current weights (or n_features x K for K runs)
+            X (Union[np.ndarray, DataSource]): Features or a data source
+            y (Optional[np.ndarray]): Labels (None for a data source)
+            loss_dtype (Optional[DTypeLike]): Accumulation dtype for the cost
+            
+        Returns:
+            float: The computed cost (one per run for 2-D weights)
+        """
+        if isinstance(X, DataSource):
+            # Weighted mean of the chunk costs, one chunk in memory at a time
+            total = 0.0
+            for X_chunk, y_chunk in X.chunks():
+                total = total + self.compute_cost(w, X_chunk, y_chunk, loss_dtype) * len(y_chunk)
+            return total / X.n_samples
+        cost, _ = self.loss_and_grad(w, X, y, with_grad=False, loss_dtype=loss_dtype)
         return cost
     
-    def evaluate_accuracy(self, w: np.ndarray, X: np.ndarray, y: np.ndarray) -> float:
+    def compute_full_gradient(self, w: np.ndarray, X: Union[np.ndarray, DataSource],
+                              y: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Compute the gradient of the cost over the whole dataset.
+        
+        Args:
+            w (np.ndarray): Current weights
+            X (Union[np.ndarray, DataSource]): Features or a data source
+            y (Optional[np.ndarray]): Labels (None for a data source)
+            
+        Returns:
+            np.ndarray: Gradient of the mean cross-entropy
+        """
+        if isinstance(X, DataSource):
+            # Weighted mean of the chunk gradients, one chunk in memory at a time
+            total = np.zeros_like(w)
+            for X_chunk, y_chunk in X.chunks():
+                total += self.compute_full_gradient(w, X_chunk, y_chunk) * len(y_chunk)
+            return total / X.n_samples
+        _, grad = self.loss_and_grad(w, X, y)
+        return grad
+    
+    def evaluate_accuracy(self, w: np.ndarray, X: Union[np.ndarray, DataSource],
+                          y: Optional[np.ndarray] = None) -> float:
         """
         Evaluate model accuracy.
         
+        Predicts the positive class where the logit is non-negative, which
+        is the same decision as ``sigmoid(z) >= 0.5`` without the sigmoid.
+        
         Args:
-            w (np.ndarray): Model weights
-            X (np.ndarray): Features
-            y (np.ndarray): True labels
+            w (np.ndarray): Model weights (or n_features x K for K runs)
+            X (Union[np.ndarray, DataSource]): Features or a data source
+            y (Optional[np.ndarray]): True labels (None for a data source)
             
         Returns:
-            float: Accuracy score
+            float: Accuracy score (one per run for 2-D weights)
         """
-        predictions = (self.sigmoid(X.dot(w)) >= 0.5).astype(int)
-        accuracy = (predictions == y).mean()
+        if isinstance(X, DataSource):
+            correct = 0
+            for X_chunk, y_chunk in X.chunks():
+                correct = correct + self.evaluate_accuracy(w, X_chunk, y_chunk) * len(y_chunk)
+            return correct / X.n_samples
+        if w.ndim == 2:
+            y = y[:, None]
+        predictions = self.logits(w, X) >= 0
+        accuracy = (predictions == y).mean(axis=0)
         return accuracy
@@ -0,0 +1,185 @@
+"""
+Training callbacks for instrumenting ``BaseOptimizer.optimize``.
+
+A callback receives the hooks of a run:
+
+- ``on_train_start(optimizer, logs)`` once, before the first epoch
+- ``on_epoch_start(optimizer, epoch)`` before every epoch (1-based)
+- ``on_step(optimizer, step, logs)`` every ``step_every`` updates
+- ``on_epoch_end(optimizer, epoch, logs)`` after the cost of every epoch
+- ``on_train_end(optimizer, logs)`` once, after the last epoch
+
+The epoch hooks cost a few clock reads per epoch. ``on_step`` is only
+called for callbacks that set ``step_every``; the driver then trains with
+an instrumented loop that times the gradient and the update of the
+sampled steps, and without such callbacks the inner loop is unchanged.
+Step hooks apply to the eager NumPy driver; the compiled and lazy paths
+only call the epoch hooks.
+"""
+
+import cProfile
+import pstats
+import tracemalloc
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+
+class Callback:
+    """
+    Base class of the training hooks; every hook does nothing by default.
+    """
+
+    # Updates between two ``on_step`` calls (None disables the step hook)
+    step_every: Optional[int] = None
+
+    def on_train_start(self, optimizer: Any, logs: Dict[str, Any]) -> None:
+        """
+        Args:
+            optimizer (Any): Optimizer being trained
+            logs (Dict[str, Any]): Epochs, samples, features, batch size
+                and first epoch of the run
+        """
+
+    def on_epoch_start(self, optimizer: Any, epoch: int) -> None:
+        """
+        Args:
+            optimizer (Any): Optimizer being trained
+            epoch (int): Epoch about to run (1-based)
+        """
+
+    def on_step(self, optimizer: Any, step: int, logs: Dict[str, Any]) -> None:
+        """
+        Args:
+            optimizer (Any): Optimizer being trained
+            step (int): Updates done before this one in the run
+            logs (Dict[str, Any]): Rows of the batch, gradient norm and the
+                seconds spent on the gradient and on the update
+        """
+
+    def on_epoch_end(self, optimizer: Any, epoch: int, logs: Dict[str, Any]) -> None:
+        """
+        Args:
+            optimizer (Any): Optimizer being trained
+            epoch (int): Epoch just finished (1-based)
+            logs (Dict[str, Any]): Cost (None when not recorded), samples,
+                samples/sec and the seconds of each phase in ``times``
+                ('shuffle', 'train' and 'cost')
+        """
+
+    def on_train_end(self, optimizer: Any, logs: Dict[str, Any]) -> None:
+        """
+        Args:
+            optimizer (Any): Optimizer being trained
+            logs (Dict[str, Any]): Epochs run, stop reason and total seconds
+        """
+
+
+class PhaseTimer(Callback):
+    """
+    Record the wall time of each phase of every epoch.
+
+    Epoch logs are kept in ``self.epochs``. With ``step_every`` the
+    gradient norm and the gradient/update times of every sampled step are
+    kept in ``self.steps`` as well.
+    """
+
+    def __init__(self, step_every: Optional[int] = None):
+        """
+        Args:
+            step_every (Optional[int]): Updates between two sampled steps
+                (None records epochs only)
+        """
+        if step_every is not None and step_every < 1:
+            raise ValueError(f"step_every must be >= 1, got {step_every}")
+        self.step_every = step_every
+        self.epochs: List[Dict[str, Any]] = []
+        self.steps: List[Dict[str, Any]] = []
+
+    def on_train_start(self, optimizer: Any, logs: Dict[str, Any]) -> None:
+        self.epochs = []
+        self.steps = []
+
+    def on_step(self, optimizer: Any, step: int, logs: Dict[str, Any]) -> None:
+        self.steps.append({'step': step, **logs})
+
+    def on_epoch_end(self, optimizer: Any, epoch: int, logs: Dict[str, Any]) -> None:
+        self.epochs.append({'epoch': epoch, **logs})
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregate the recorded epochs and steps.
+
+        Returns:
+            Dict[str, Any]: Total seconds per phase, mean samples/sec and,
+            when steps were sampled, mean gradient and update seconds per
+            step and mean gradient norm
+        """
+        phases = {}
+        for logs in self.epochs:
+            for phase, seconds in logs['times'].items():
+                phases[phase] = phases.get(phase, 0.0) + seconds
+        summary = {
+            'epochs': len(self.epochs),
+            'times': phases,
+            'samples_per_sec': (float(np.mean([logs['samples_per_sec'] for logs in self.epochs]))
+                                if self.epochs else 0.0)
+        }
+        if self.steps:
+            for field in ('grad_time', 'update_time', 'grad_norm'):
+                summary[field] = float(np.mean([logs[field] for logs in self.steps]))
+        return summary
+
+
+class ProfilerCapture(Callback):
+    """
+    Capture a cProfile or tracemalloc profile of a whole run.
+
+    Both modes slow training down noticeably, so they are meant for
+    diagnosis rather than for timing. After the run ``self.stats`` holds a
+    ``pstats.Stats`` (cProfile) or the largest allocation sites as
+    ``tracemalloc.Statistic`` entries, and ``self.peak_bytes`` the peak
+    traced memory (tracemalloc).
+    """
+
+    def __init__(self, mode: str = 'cprofile', path: Optional[str] = None, top: int = 20):
+        """
+        Args:
+            mode (str): 'cprofile' or 'tracemalloc'
+            path (Optional[str]): File for the raw cProfile stats
+            top (int): Allocation sites kept by the tracemalloc mode
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"mode must be one of {PROFILE_MODES}, got {mode!r}")
+        self.mode = mode
+        self.path = path
+        self.top = top
+        self.stats = None
+        self.peak_bytes = None
+        self._profiler = None
+        self._started = False
+
+    def on_train_start(self, optimizer: Any, logs: Dict[str, Any]) -> None:
+        if self.mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            # Leave an outer tracemalloc session running
+            self._started = not tracemalloc.is_tracing()
+            if self._started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+    def on_train_end(self, optimizer: Any, logs: Dict[str, Any]) -> None:
+        if self.mode == 'cprofile':
+            self._profiler.disable()
+            self.stats = pstats.Stats(self._profiler)
+            if self.path is not None:
+                self.stats.dump_stats(self.path)
+            self._profiler = None
+        else:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+            self.stats = tracemalloc.take_snapshot().statistics('lineno')[:self.top]
+            if self._started:
+                tracemalloc.stop()
@@ -0,0 +1,100 @@
+"""
+Checkpoint files for resuming optimizer runs.
+
+A checkpoint is a single ``.npz`` archive holding the arrays of a run
+(weights, optimizer state, cost history) plus a JSON metadata entry with
+the scalars and the position of the random stream. Files are written to
+a temporary name in the same directory and moved into place, so a run
+killed mid-write leaves the previous checkpoint intact.
+"""
+
+import json
+import os
+import tempfile
+import numpy as np
+from typing import Any, Dict, Tuple
+
+# Archive entry holding the JSON metadata
+META_KEY = '__meta__'
+
+
+def _to_json(value: Any) -> Any:
+    """Convert NumPy values in random states to JSON types."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"cannot serialize {type(value).__name__}")
+
+
+def get_rng_state(rng: Any) -> Dict[str, Any]:
+    """
+    Return the state of a Generator (or of the global ``np.random``).
+
+    Args:
+        rng (Any): ``np.random.Generator`` or the ``np.random`` module
+
+    Returns:
+        Dict[str, Any]: JSON-serializable bit generator state
+    """
+    if isinstance(rng, np.random.Generator):
+        state = rng.bit_generator.state
+    else:
+        state = rng.get_state(legacy=False)
+    return json.loads(json.dumps(state, default=_to_json))
+
+
+def set_rng_state(rng: Any, state: Dict[str, Any]) -> None:
+    """
+    Restore a state returned by ``get_rng_state``.
+
+    Args:
+        rng (Any): ``np.random.Generator`` or the ``np.random`` module
+        state (Dict[str, Any]): Saved bit generator state
+    """
+    if isinstance(rng, np.random.Generator):
+        rng.bit_generator.state = state
+    else:
+        state = dict(state, state={key: np.asarray(value, dtype=np.uint32)
+                                   if key == 'key' else value
+                                   for key, value in state['state'].items()})
+        rng.set_state(state)
+
+
+def save_checkpoint(path: str, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+    """
+    Atomically write arrays and metadata to a compressed ``.npz`` file.
+
+    Args:
+        path (str): Destination file
+        arrays (Dict[str, np.ndarray]): Arrays to store, keyed by name
+        meta (Dict[str, Any]): JSON-serializable metadata
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, **arrays, **{META_KEY: np.array(json.dumps(meta))})
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_checkpoint(path: str) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Read a checkpoint written by ``save_checkpoint``.
+
+    Args:
+        path (str): Checkpoint file
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], Dict[str, Any]]: Arrays and metadata
+    """
+    with np.load(path, allow_pickle=False) as archive:
+        arrays = {key: archive[key] for key in archive.files if key != META_KEY}
+        meta = json.loads(str(archive[META_KEY]))
+    return arrays, meta
@@ -0,0 +1,214 @@
+"""
+Data sources consumed by the optimizers.
+
+A data source hands the training driver its examples one in-memory chunk
+at a time. In-memory arrays are a single chunk. Memory-mapped ``.npy``
+files are read chunk by chunk with a chunk-order shuffle, and the driver
+shuffles the rows inside each chunk, so reads stay mostly sequential and
+peak memory is bounded by the chunk size instead of the dataset size.
+"""
+
+import os
+import numpy as np
+from abc import ABC, abstractmethod
+from numpy.typing import DTypeLike
+from typing import Any, Iterator, Optional, Tuple, Union
+
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
+
+
+def issparse(X: Any) -> bool:
+    """Return True if ``X`` is a scipy.sparse matrix (False without scipy)."""
+    return sp is not None and sp.issparse(X)
+
+
+class DataSource(ABC):
+    """
+    Abstract base class for training data.
+
+    Subclasses set ``n_samples``, ``n_features`` and ``dtype`` and yield
+    ``(X_chunk, y_chunk)`` pairs of in-memory arrays in the training dtype.
+    """
+
+    n_samples: int
+    n_features: int
+    dtype: np.dtype
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Shape of the full feature matrix."""
+        return self.n_samples, self.n_features
+
+    @abstractmethod
+    def chunks(self, rng=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Iterate over the data in chunks.
+
+        Args:
+            rng: Random stream used to shuffle the chunk order (sequential
+                order when None)
+
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: Features and labels of one chunk
+        """
+        pass
+
+    @abstractmethod
+    def take(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the given rows into memory.
+
+        Args:
+            rows (np.ndarray): Sorted row indices
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Features and labels of the rows
+        """
+        pass
+
+
+class ArrayDataSource(DataSource):
+    """
+    In-memory arrays exposed as a single chunk.
+
+    Sparse features are converted to canonical CSR (one entry per row and
+    column) so the driver can read each row's nonzeros directly.
+    """
+
+    def __init__(self, X: Any, y: np.ndarray, dtype: Optional[DTypeLike] = None):
+        """
+        Args:
+            X (Any): Features (m x n), dense or scipy.sparse
+            y (np.ndarray): Labels (m,)
+            dtype (Optional[DTypeLike]): Training dtype (defaults to the
+                floating dtype of X, or float64)
+        """
+        if dtype is None:
+            dtype = X.dtype if X.dtype.kind == 'f' else np.float64
+        if issparse(X):
+            X = sp.csr_matrix(X, dtype=dtype, copy=True)
+            X.sum_duplicates()
+            self.X = X
+        else:
+            self.X = np.asarray(X, dtype=dtype)
+        self.y = np.asarray(y, dtype=dtype)
+        self.n_samples, self.n_features = self.X.shape
+        self.dtype = self.X.dtype
+
+    def chunks(self, rng=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield the whole dataset as one chunk."""
+        yield self.X, self.y
+
+    def take(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Gather the given rows."""
+        return self.X[rows], self.y[rows]
+
+
+class MemmapDataSource(DataSource):
+    """
+    Features and labels stored as ``.npy`` files and read in chunks.
+
+    Each chunk is copied out of a short-lived memory map that is closed
+    right after the read, so pages of the file do not accumulate in the
+    resident set of the process.
+    """
+
+    def __init__(self, X_path: str, y_path: str, chunk_rows: int = 65536,
+                 dtype: Optional[DTypeLike] = None):
+        """
+        Args:
+            X_path (str): Path of the (m x n) feature ``.npy`` file
+            y_path (str): Path of the (m,) label ``.npy`` file
+            chunk_rows (int): Number of rows loaded into memory at a time
+            dtype (Optional[DTypeLike]): Training dtype (defaults to the
+                floating dtype of the file, or float64)
+        """
+        if chunk_rows < 1:
+            raise ValueError(f"chunk_rows must be >= 1, got {chunk_rows}")
+        self.X_path = X_path
+        self.y_path = y_path
+        self.chunk_rows = chunk_rows
+
+        X = np.load(X_path, mmap_mode='r')
+        y = np.load(y_path, mmap_mode='r')
+        if X.ndim != 2 or y.shape != (X.shape[0],):
+            raise ValueError(f"incompatible shapes {X.shape} and {y.shape}")
+        self.n_samples, self.n_features = X.shape
+        if dtype is None:
+            dtype = X.dtype if X.dtype.kind == 'f' else np.float64
+        self.dtype = np.dtype(dtype)
+        del X, y
+
+    @classmethod
+    def create(cls, directory: str, X: np.ndarray, y: np.ndarray,
+               chunk_rows: int = 65536) -> 'MemmapDataSource':
+        """
+        Write features and labels to ``directory`` and open them as a source.
+
+        ``X`` may itself be a memory map; it is copied in chunks.
+
+        Args:
+            directory (str): Output directory (created if needed)
+            X (np.ndarray): Features (m x n)
+            y (np.ndarray): Labels (m,)
+            chunk_rows (int): Rows per chunk for writing and reading
+
+        Returns:
+            MemmapDataSource: Source reading the written files
+        """
+        os.makedirs(directory, exist_ok=True)
+        X_path = os.path.join(directory, 'X.npy')
+        y_path = os.path.join(directory, 'y.npy')
+        out = np.lib.format.open_memmap(X_path, mode='w+', dtype=X.dtype, shape=X.shape)
+        for start in range(0, X.shape[0], chunk_rows):
+            out[start:start + chunk_rows] = X[start:start + chunk_rows]
+        out.flush()
+        del out
+        np.save(y_path, np.asarray(y))
+        return cls(X_path, y_path, chunk_rows=chunk_rows)
+
+    def _read(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Copy rows ``start:stop`` into memory in the training dtype."""
+        X = np.load(self.X_path, mmap_mode='r')
+        y = np.load(self.y_path, mmap_mode='r')
+        return (np.array(X[start:stop], dtype=self.dtype),
+                np.array(y[start:stop], dtype=self.dtype))
+
+    def chunks(self, rng=None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield contiguous chunks, in shuffled order when ``rng`` is given."""
+        starts = np.arange(0, self.n_samples, self.chunk_rows)
+        if rng is not None and len(starts) > 1:
+            starts = starts[rng.permutation(len(starts))]
+        for start in starts:
+            yield self._read(start, start + self.chunk_rows)
+
+    def take(self, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Gather the given rows from the files."""
+        X = np.load(self.X_path, mmap_mode='r')
+        y = np.load(self.y_path, mmap_mode='r')
+        return np.array(X[rows], dtype=self.dtype), np.array(y[rows], dtype=self.dtype)
+
+
+def as_data_source(X: Union[np.ndarray, DataSource], y: Optional[np.ndarray] = None,
+                   dtype: Optional[DTypeLike] = None) -> DataSource:
+    """
+    Wrap arrays in an ``ArrayDataSource``; pass data sources through.
+
+    Args:
+        X (Union[np.ndarray, DataSource]): Features or a data source
+        y (Optional[np.ndarray]): Labels (required for arrays)
+        dtype (Optional[DTypeLike]): Training dtype for arrays
+
+    Returns:
+        DataSource: The data as a source
+    """
+    if isinstance(X, DataSource):
+        if y is not None:
+            raise ValueError("y must be None when X is a DataSource")
+        return X
+    if y is None:
+        raise ValueError("y is required when X is an array")
+    return ArrayDataSource(X, y, dtype)
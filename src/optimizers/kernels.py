@@ -0,0 +1,117 @@
+"""
+Compiled per-sample epoch kernels for the optional numba backend.
+
+Each kernel runs one full epoch of true per-sample updates over the
+shuffled ``indices`` and mutates the weights and state arrays in place.
+With ``track_loss`` set, a kernel also returns the sum of the per-sample
+losses seen during the pass (used by the 'running' cost mode).
+When numba is not installed the functions stay plain Python and the
+optimizers fall back to the NumPy driver instead of calling them.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op replacement for ``numba.njit`` when numba is missing."""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True)
+def _logit(X, w, i):
+    """Return ``X[i] . w``."""
+    z = 0.0
+    for j in range(X.shape[1]):
+        z += X[i, j] * w[j]
+    return z
+
+
+@njit(cache=True)
+def _sigmoid(z):
+    """Sigmoid with the same clipping as ``BaseOptimizer.sigmoid``."""
+    if z > 500.0:
+        z = 500.0
+    elif z < -500.0:
+        z = -500.0
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+@njit(cache=True)
+def _sample_loss(z, y):
+    """Cross-entropy of one example from its logit, ``log(1 + e^z) - y z``."""
+    return max(z, 0.0) + np.log1p(np.exp(-abs(z))) - y * z
+
+
+@njit(cache=True)
+def sgd_epoch(X, y, w, indices, learning_rate, track_loss):
+    """One epoch of per-sample SGD."""
+    loss = 0.0
+    for i in indices:
+        z = _logit(X, w, i)
+        if track_loss:
+            loss += _sample_loss(z, y[i])
+        r = _sigmoid(z) - y[i]
+        for j in range(X.shape[1]):
+            w[j] -= (X[i, j] * r) * learning_rate
+    return loss
+
+
+@njit(cache=True)
+def momentum_epoch(X, y, w, indices, learning_rate, momentum, v, track_loss):
+    """One epoch of per-sample SGD with momentum."""
+    loss = 0.0
+    for i in indices:
+        z = _logit(X, w, i)
+        if track_loss:
+            loss += _sample_loss(z, y[i])
+        r = _sigmoid(z) - y[i]
+        for j in range(X.shape[1]):
+            v[j] = v[j] * momentum + (X[i, j] * r) * learning_rate
+            w[j] -= v[j]
+    return loss
+
+
+@njit(cache=True)
+def rmsprop_epoch(X, y, w, indices, learning_rate, rho, epsilon, E_grad2, track_loss):
+    """One epoch of per-sample RMSProp."""
+    loss = 0.0
+    for i in indices:
+        z = _logit(X, w, i)
+        if track_loss:
+            loss += _sample_loss(z, y[i])
+        r = _sigmoid(z) - y[i]
+        for j in range(X.shape[1]):
+            g = X[i, j] * r
+            E_grad2[j] = E_grad2[j] * rho + (g * g) * (1 - rho)
+            w[j] -= (learning_rate / (np.sqrt(E_grad2[j]) + epsilon)) * g
+    return loss
+
+
+@njit(cache=True)
+def adam_epoch(X, y, w, indices, learning_rate, beta1, beta2, epsilon,
+               m_moment, v_moment, t, track_loss):
+    """One epoch of per-sample Adam; returns the time step and the loss sum."""
+    loss = 0.0
+    for i in indices:
+        t += 1
+        bias1 = 1 - beta1 ** t
+        bias2 = 1 - beta2 ** t
+        z = _logit(X, w, i)
+        if track_loss:
+            loss += _sample_loss(z, y[i])
+        r = _sigmoid(z) - y[i]
+        for j in range(X.shape[1]):
+            g = X[i, j] * r
+            m_moment[j] = m_moment[j] * beta1 + g * (1 - beta1)
+            v_moment[j] = v_moment[j] * beta2 + (g * g) * (1 - beta2)
+            m_hat = m_moment[j] / bias1
+            v_hat = v_moment[j] / bias2
+            w[j] -= (learning_rate / (np.sqrt(v_hat) + epsilon)) * m_hat
+    return t, loss
@@ -3,8 +3,9 @@ SGD with Momentum optimizer implementation.
 """
 
 import numpy as np
-from typing import Tuple, List
+from typing import Any, Dict, Optional
 from .base_optimizer import BaseOptimizer
+from .kernels import momentum_epoch
 
 
 class SGDMomentum(BaseOptimizer):
@@ -15,55 +16,76 @@ class SGDMomentum(BaseOptimizer):
     in the objective across iterations.
     """
     
-    def __init__(self, learning_rate: float = 0.03, momentum: float = 0.9):
+    def __init__(self, learning_rate: float = 0.03, momentum: float = 0.9,
+                 backend: str = 'numpy',
+                 seed: Optional[int] = None, rng: Optional[np.random.Generator] = None):
         """
         Initialize SGD with Momentum optimizer.
         
         Args:
             learning_rate (float): Learning rate for weight updates
             momentum (float): Momentum factor (typically 0.9)
+            backend (str): 'numpy', or 'numba' for compiled per-sample epochs
+            seed (Optional[int]): Seed for a private random stream
+            rng (Optional[np.random.Generator]): Random stream to use (overrides seed)
         """
-        super().__init__(learning_rate)
+        super().__init__(learning_rate, backend, seed, rng)
         self.momentum = momentum
         self.name = "SGD + Momentum"
     
-    def optimize(self, X: np.ndarray, y: np.ndarray, epochs: int = 30) -> Tuple[np.ndarray, List[float]]:
+    def init_state(self, w: np.ndarray) -> Dict[str, Any]:
+        """Allocate the velocity and a scratch buffer."""
+        return {
+            'v': np.zeros_like(w),  # Initialize velocity
+            'update': np.empty_like(w)
+        }
+    
+    def update(self, w: np.ndarray, grad: np.ndarray, state: Dict[str, Any]) -> None:
         """
-        Optimize weights using SGD with momentum.
+        Apply the momentum update in place.
         
         Args:
-            X (np.ndarray): Training features (m x n)
-            y (np.ndarray): Training labels (m,)
-            epochs (int): Number of training epochs
-            
-        Returns:
-            Tuple[np.ndarray, List[float]]: Final weights and cost history
+            w (np.ndarray): Current weights, updated in place
+            grad (np.ndarray): Gradient for the current batch
+            state (Dict[str, Any]): Buffers created by ``init_state``
         """
-        m, n = X.shape
-        w = np.random.normal(0, 0.01, n)  # Small random initialization
-        v = np.zeros(n)  # Initialize velocity
-        costs = []
+        v, update = state['v'], state['update']
         
-        for epoch in range(epochs):
-            # Shuffle indices for each epoch
-            indices = np.random.permutation(m)
-            
-            # Update for each individual example
-            for i in indices:
-                # Compute prediction for current example
-                z = X[i].dot(w)
-                h = self.sigmoid(z)
-                
-                # Compute gradient for current example
-                grad = (h - y[i]) * X[i]
-                
-                # Momentum update
-                v = self.momentum * v + self.learning_rate * grad
-                w = w - v
-            
-            # Compute cost at end of epoch
-            cost = self.compute_cost(w, X, y)
-            costs.append(cost)
+        # Momentum update: v = momentum * v + learning_rate * grad
+        v *= self.momentum
+        np.multiply(grad, self.learning_rate, out=update)
+        v += update
+        w -= v
+    
+    def sparse_update(self, w: np.ndarray, cols: np.ndarray, grad: np.ndarray,
+                      state: Dict[str, Any]) -> None:
+        """Apply the momentum update to the columns ``cols`` only."""
+        v = state['v']
+        v_cols = v[cols] * self.momentum + grad * self.learning_rate
+        v[cols] = v_cols
+        w[cols] -= v_cols
+    
+    def catch_up(self, w: np.ndarray, cols: np.ndarray, skipped: np.ndarray,
+                 state: Dict[str, Any]) -> None:
+        """
+        Apply skipped zero-gradient momentum steps in closed form.
         
-        self.costs_history = costs
-        return w, costs
+        With a zero gradient the velocity only decays, and over k steps the
+        weight moves by ``v * (momentum + ... + momentum^k)``.
+        """
+        v = state['v']
+        v_cols = v[cols]
+        decay = self.momentum ** skipped
+        if self.momentum == 1:
+            total = skipped
+        else:
+            total = self.momentum * (1 - decay) / (1 - self.momentum)
+        w[cols] -= v_cols * total
+        v[cols] = v_cols * decay
+    
+    def compiled_epoch(self, X: np.ndarray, y: np.ndarray, w: np.ndarray,
+                       indices: np.ndarray, state: Dict[str, Any],
+                       track_loss: bool = False) -> float:
+        """Run one per-sample momentum epoch with the numba kernel."""
+        return momentum_epoch(X, y, w, indices, self.learning_rate, self.momentum,
+                              state['v'], track_loss)
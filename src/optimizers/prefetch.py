@@ -0,0 +1,93 @@
+"""
+Background prefetching of shuffled rows into reusable buffers.
+
+Training on a shuffled order gathers rows from random memory locations.
+The prefetcher copies the next block of shuffled rows into a contiguous
+buffer on a worker thread while the driver trains on the current block,
+alternating between two preallocated buffers. ``np.take`` releases the
+GIL during the copy, so the gather overlaps with the updates.
+"""
+
+import queue
+import threading
+import numpy as np
+from numpy.typing import DTypeLike
+from typing import Iterator, Tuple
+
+
+class BatchPrefetcher:
+    """
+    Gather blocks of shuffled rows on a background thread.
+
+    The buffers are allocated once and reused for every block, chunk and
+    epoch of a run.
+    """
+
+    def __init__(self, n_features: int, block_rows: int, dtype: DTypeLike):
+        """
+        Args:
+            n_features (int): Number of features per row
+            block_rows (int): Rows gathered per block
+            dtype (DTypeLike): Dtype of the features and labels
+        """
+        if block_rows < 1:
+            raise ValueError(f"block_rows must be >= 1, got {block_rows}")
+        self.block_rows = block_rows
+        self.X_buffers = np.empty((2, block_rows, n_features), dtype=dtype)
+        self.y_buffers = np.empty((2, block_rows), dtype=dtype)
+
+    def blocks(self, X: np.ndarray, y: np.ndarray,
+               indices: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Yield the rows ``indices`` in order, as contiguous blocks.
+
+        Each yielded block is a view of a buffer that is refilled once the
+        next block has been requested, so it must not be kept.
+
+        Args:
+            X (np.ndarray): Features in the buffer dtype
+            y (np.ndarray): Labels in the buffer dtype
+            indices (np.ndarray): Shuffled row order
+
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: Features and labels of one block
+        """
+        free = queue.Queue()
+        ready = queue.Queue()
+        free.put(0)
+        free.put(1)
+        stop = threading.Event()
+
+        def fill() -> None:
+            try:
+                for start in range(0, len(indices), self.block_rows):
+                    slot = free.get()
+                    if stop.is_set():
+                        return
+                    rows = indices[start:start + self.block_rows]
+                    # mode='clip' writes straight into the buffer ('raise' buffers out)
+                    np.take(X, rows, axis=0, out=self.X_buffers[slot, :len(rows)], mode='clip')
+                    np.take(y, rows, out=self.y_buffers[slot, :len(rows)], mode='clip')
+                    ready.put((slot, len(rows)))
+            except BaseException as exc:
+                ready.put(exc)
+                return
+            ready.put(None)
+
+        worker = threading.Thread(target=fill, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                slot, k = item
+                yield self.X_buffers[slot, :k], self.y_buffers[slot, :k]
+                free.put(slot)
+        finally:
+            # Release a worker that is waiting for a buffer
+            stop.set()
+            free.put(0)
+            worker.join()
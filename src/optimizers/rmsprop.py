@@ -3,8 +3,9 @@ RMSProp optimizer implementation.
 """
 
 import numpy as np
-from typing import Tuple, List
+from typing import Any, Dict, Optional
 from .base_optimizer import BaseOptimizer
+from .kernels import rmsprop_epoch
 
 
 class RMSProp(BaseOptimizer):
@@ -15,7 +16,9 @@ class RMSProp(BaseOptimizer):
     average of the magnitudes of recent gradients.
     """
     
-    def __init__(self, learning_rate: float = 0.05, rho: float = 0.9, epsilon: float = 1e-8):
+    def __init__(self, learning_rate: float = 0.05, rho: float = 0.9, epsilon: float = 1e-8,
+                 backend: str = 'numpy',
+                 seed: Optional[int] = None, rng: Optional[np.random.Generator] = None):
         """
         Initialize RMSProp optimizer.
         
@@ -23,51 +26,67 @@ class RMSProp(BaseOptimizer):
             learning_rate (float): Learning rate for weight updates
             rho (float): Decay rate for the moving average (typically 0.9)
             epsilon (float): Small constant to prevent division by zero
+            backend (str): 'numpy', or 'numba' for compiled per-sample epochs
+            seed (Optional[int]): Seed for a private random stream
+            rng (Optional[np.random.Generator]): Random stream to use (overrides seed)
         """
-        super().__init__(learning_rate)
+        super().__init__(learning_rate, backend, seed, rng)
         self.rho = rho
         self.epsilon = epsilon
         self.name = "RMSProp"
     
-    def optimize(self, X: np.ndarray, y: np.ndarray, epochs: int = 30) -> Tuple[np.ndarray, List[float]]:
+    def init_state(self, w: np.ndarray) -> Dict[str, Any]:
+        """Allocate the squared gradient accumulator and a scratch buffer."""
+        return {
+            'E_grad2': np.zeros_like(w),  # Initialize squared gradient accumulator
+            'update': np.empty_like(w)
+        }
+    
+    def update(self, w: np.ndarray, grad: np.ndarray, state: Dict[str, Any]) -> None:
         """
-        Optimize weights using RMSProp.
+        Apply the RMSProp update in place.
         
         Args:
-            X (np.ndarray): Training features (m x n)
-            y (np.ndarray): Training labels (m,)
-            epochs (int): Number of training epochs
-            
-        Returns:
-            Tuple[np.ndarray, List[float]]: Final weights and cost history
+            w (np.ndarray): Current weights, updated in place
+            grad (np.ndarray): Gradient for the current batch
+            state (Dict[str, Any]): Buffers created by ``init_state``
         """
-        m, n = X.shape
-        w = np.random.normal(0, 0.01, n)  # Small random initialization
-        E_grad2 = np.zeros(n)  # Initialize squared gradient accumulator
-        costs = []
+        E_grad2, update = state['E_grad2'], state['update']
         
-        for epoch in range(epochs):
-            # Shuffle indices for each epoch
-            indices = np.random.permutation(m)
-            
-            # Update for each individual example
-            for i in indices:
-                # Compute prediction for current example
-                z = X[i].dot(w)
-                h = self.sigmoid(z)
-                
-                # Compute gradient for current example
-                grad = (h - y[i]) * X[i]
-                
-                # Update squared gradient accumulator
-                E_grad2 = self.rho * E_grad2 + (1 - self.rho) * (grad ** 2)
-                
-                # RMSProp update
-                w = w - (self.learning_rate / (np.sqrt(E_grad2) + self.epsilon)) * grad
-            
-            # Compute cost at end of epoch
-            cost = self.compute_cost(w, X, y)
-            costs.append(cost)
+        # Update squared gradient accumulator
+        E_grad2 *= self.rho
+        np.multiply(grad, grad, out=update)
+        update *= 1 - self.rho
+        E_grad2 += update
         
-        self.costs_history = costs
-        return w, costs
+        # RMSProp update: w -= learning_rate / (sqrt(E_grad2) + epsilon) * grad
+        np.sqrt(E_grad2, out=update)
+        update += self.epsilon
+        np.divide(self.learning_rate, update, out=update)
+        update *= grad
+        w -= update
+    
+    def sparse_update(self, w: np.ndarray, cols: np.ndarray, grad: np.ndarray,
+                      state: Dict[str, Any]) -> None:
+        """Apply the RMSProp update to the columns ``cols`` only."""
+        E_grad2 = state['E_grad2']
+        E_cols = E_grad2[cols] * self.rho + (grad * grad) * (1 - self.rho)
+        E_grad2[cols] = E_cols
+        w[cols] -= (self.learning_rate / (np.sqrt(E_cols) + self.epsilon)) * grad
+    
+    def catch_up(self, w: np.ndarray, cols: np.ndarray, skipped: np.ndarray,
+                 state: Dict[str, Any]) -> None:
+        """
+        Apply skipped zero-gradient RMSProp steps in closed form.
+        
+        A zero gradient leaves the weight unchanged and decays the
+        accumulator by ``rho`` per step.
+        """
+        state['E_grad2'][cols] *= self.rho ** skipped
+    
+    def compiled_epoch(self, X: np.ndarray, y: np.ndarray, w: np.ndarray,
+                       indices: np.ndarray, state: Dict[str, Any],
+                       track_loss: bool = False) -> float:
+        """Run one per-sample RMSProp epoch with the numba kernel."""
+        return rmsprop_epoch(X, y, w, indices, self.learning_rate, self.rho,
+                             self.epsilon, state['E_grad2'], track_loss)
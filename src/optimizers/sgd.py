@@ -3,63 +3,59 @@ Stochastic Gradient Descent (SGD) optimizer implementation.
 """
 
 import numpy as np
-from typing import Tuple, List
+from typing import Any, Dict, Optional
 from .base_optimizer import BaseOptimizer
+from .kernels import sgd_epoch
 
 
 class SGD(BaseOptimizer):
     """
     Standard Stochastic Gradient Descent optimizer.
     
-    This implementation performs updates using individual examples
-    (true SGD) rather than mini-batches.
+    By default this implementation performs updates using individual
+    examples (true SGD); ``batch_size`` switches to mini-batches.
     """
     
-    def __init__(self, learning_rate: float = 0.05):
+    def __init__(self, learning_rate: float = 0.05, backend: str = 'numpy',
+                 seed: Optional[int] = None, rng: Optional[np.random.Generator] = None):
         """
         Initialize SGD optimizer.
         
         Args:
             learning_rate (float): Learning rate for weight updates
+            backend (str): 'numpy', or 'numba' for compiled per-sample epochs
+            seed (Optional[int]): Seed for a private random stream
+            rng (Optional[np.random.Generator]): Random stream to use (overrides seed)
         """
-        super().__init__(learning_rate)
+        super().__init__(learning_rate, backend, seed, rng)
         self.name = "SGD"
     
-    def optimize(self, X: np.ndarray, y: np.ndarray, epochs: int = 30) -> Tuple[np.ndarray, List[float]]:
+    def init_state(self, w: np.ndarray) -> Dict[str, Any]:
+        """Allocate the scratch buffer for the scaled gradient."""
+        return {'update': np.empty_like(w)}
+    
+    def update(self, w: np.ndarray, grad: np.ndarray, state: Dict[str, Any]) -> None:
         """
-        Optimize weights using standard SGD.
+        Apply the SGD update in place.
         
         Args:
-            X (np.ndarray): Training features (m x n)
-            y (np.ndarray): Training labels (m,)
-            epochs (int): Number of training epochs
-            
-        Returns:
-            Tuple[np.ndarray, List[float]]: Final weights and cost history
+            w (np.ndarray): Current weights, updated in place
+            grad (np.ndarray): Gradient for the current batch
+            state (Dict[str, Any]): Buffers created by ``init_state``
         """
-        m, n = X.shape
-        w = np.random.normal(0, 0.01, n)  # Small random initialization
-        costs = []
-        
-        for epoch in range(epochs):
-            # Shuffle indices for each epoch
-            indices = np.random.permutation(m)
-            
-            # Update for each individual example
-            for i in indices:
-                # Compute prediction for current example
-                z = X[i].dot(w)
-                h = self.sigmoid(z)
-                
-                # Compute gradient for current example
-                grad = (h - y[i]) * X[i]
-                
-                # SGD update
-                w = w - self.learning_rate * grad
-            
-            # Compute cost at end of epoch
-            cost = self.compute_cost(w, X, y)
-            costs.append(cost)
+        update = state['update']
         
-        self.costs_history = costs
-        return w, costs
+        # SGD update
+        np.multiply(grad, self.learning_rate, out=update)
+        w -= update
+    
+    def sparse_update(self, w: np.ndarray, cols: np.ndarray, grad: np.ndarray,
+                      state: Dict[str, Any]) -> None:
+        """Apply the SGD update to the columns ``cols`` only."""
+        w[cols] -= grad * self.learning_rate
+    
+    def compiled_epoch(self, X: np.ndarray, y: np.ndarray, w: np.ndarray,
+                       indices: np.ndarray, state: Dict[str, Any],
+                       track_loss: bool = False) -> float:
+        """Run one per-sample SGD epoch with the numba kernel."""
+        return sgd_epoch(X, y, w, indices, self.learning_rate, track_loss)
@@ -0,0 +1,210 @@
+"""
+Hyperparameter sweeps with successive halving and Hyperband.
+
+A search space maps each optimizer argument to its candidate values:
+
+- a list: choose one of the values
+- ``('uniform', low, high)``: uniform in ``[low, high)``
+- ``('log', low, high)``: log-uniform in ``[low, high)``
+- any other value: fixed
+
+Successive halving trains many sampled configurations for a few epochs
+and promotes the best ``1 / eta`` of them to ``eta`` times more epochs,
+rung after rung. Promoted runs resume from their checkpoint instead of
+starting over, so a configuration is never trained twice for the same
+epochs, and every (configuration, epochs) result is cached.
+"""
+
+import hashlib
+import json
+import math
+import os
+import sys
+import tempfile
+import numpy as np
+from typing import Any, Dict, List, Optional, Type
+
+# Add src to path for imports
+sys.path.append(os.path.dirname(__file__))
+
+from optimizers import BaseOptimizer
+
+
+def sample_config(space: Dict[str, Any], rng: np.random.Generator) -> Dict[str, Any]:
+    """
+    Draw one configuration from a search space.
+
+    Args:
+        space (Dict[str, Any]): Search space (see the module docstring)
+        rng (np.random.Generator): Random stream
+
+    Returns:
+        Dict[str, Any]: Optimizer arguments
+    """
+    config = {}
+    for name, values in space.items():
+        if isinstance(values, list):
+            config[name] = values[rng.integers(len(values))]
+        elif isinstance(values, tuple) and values[0] == 'uniform':
+            config[name] = float(rng.uniform(values[1], values[2]))
+        elif isinstance(values, tuple) and values[0] == 'log':
+            config[name] = float(np.exp(rng.uniform(np.log(values[1]), np.log(values[2]))))
+        else:
+            config[name] = values
+    return config
+
+
+class SweepRunner:
+    """
+    Train and score optimizer configurations with cached, resumable runs.
+
+    Each configuration is trained on the training data with a fixed seed
+    and scored by its cost on the validation data. Checkpoints are kept in
+    ``cache_dir`` (a temporary directory by default), so asking for more
+    epochs of a configuration continues its earlier run.
+    """
+
+    def __init__(self, X_train: np.ndarray, y_train: np.ndarray,
+                 X_val: np.ndarray, y_val: np.ndarray, seed: int = 42,
+                 batch_size: int = 1, fit_params: Optional[Dict[str, Any]] = None,
+                 cache_dir: Optional[str] = None):
+        """
+        Args:
+            X_train (np.ndarray): Training features
+            y_train (np.ndarray): Training labels
+            X_val (np.ndarray): Validation features used for scoring
+            y_val (np.ndarray): Validation labels used for scoring
+            seed (int): Seed of every run
+            batch_size (int): Examples per optimizer update
+            fit_params (Optional[Dict[str, Any]]): Extra ``optimize`` arguments
+                (with ``patience``, the validation data defaults to ``X_val``)
+            cache_dir (Optional[str]): Directory for the run checkpoints
+        """
+        self.X_train, self.y_train = X_train, y_train
+        self.X_val, self.y_val = X_val, y_val
+        self.seed = seed
+        self.batch_size = batch_size
+        self.fit_params = dict(fit_params or {})
+        if cache_dir is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix='sweep_')
+            cache_dir = self._tmp.name
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.cache = {}
+        self.epochs_trained = 0
+
+    def config_key(self, optimizer_class: Type[BaseOptimizer], params: Dict[str, Any]) -> str:
+        """Return a stable identifier of a configuration and the run settings."""
+        description = json.dumps({
+            'optimizer': optimizer_class.__name__,
+            'params': params,
+            'seed': self.seed,
+            'batch_size': self.batch_size,
+            'fit_params': self.fit_params
+        }, sort_keys=True, default=str)
+        return hashlib.sha1(description.encode()).hexdigest()[:16]
+
+    def checkpoint_path(self, key: str, epochs: int) -> str:
+        """Return the checkpoint file of a configuration after ``epochs`` epochs."""
+        return os.path.join(self.cache_dir, f"{key}_{epochs}.npz")
+
+    def evaluate(self, optimizer_class: Type[BaseOptimizer], params: Dict[str, Any],
+                 epochs: int) -> Dict[str, Any]:
+        """
+        Train a configuration for ``epochs`` epochs in total and score it.
+
+        Args:
+            optimizer_class (Type[BaseOptimizer]): Optimizer to train
+            params (Dict[str, Any]): Constructor arguments
+            epochs (int): Total number of epochs
+
+        Returns:
+            Dict[str, Any]: Params, epochs, validation cost, cost history
+            and final weights
+        """
+        key = self.config_key(optimizer_class, params)
+        if (key, epochs) in self.cache:
+            return self.cache[key, epochs]
+
+        # Continue the longest shorter run of this configuration
+        done = max((e for k, e in self.cache if k == key and e < epochs), default=0)
+        fit_params = dict(self.fit_params)
+        if fit_params.get('patience') is not None:
+            # Early stopping watches the same split the configurations are scored on
+            fit_params.setdefault('X_val', self.X_val)
+            fit_params.setdefault('y_val', self.y_val)
+        optimizer = optimizer_class(**params, seed=self.seed)
+        weights, costs = optimizer.optimize(
+            self.X_train, self.y_train, epochs, batch_size=self.batch_size,
+            checkpoint_path=self.checkpoint_path(key, epochs),
+            resume_from=self.checkpoint_path(key, done) if done else None, **fit_params
+        )
+        self.epochs_trained += optimizer.epochs_run - done
+
+        result = {
+            'optimizer': optimizer_class.__name__,
+            'params': params,
+            'epochs': epochs,
+            'val_cost': float(optimizer.compute_cost(weights, self.X_val, self.y_val)),
+            'costs': costs,
+            'weights': weights
+        }
+        self.cache[key, epochs] = result
+        return result
+
+    def successive_halving(self, optimizer_class: Type[BaseOptimizer],
+                           configs: List[Dict[str, Any]], min_epochs: int,
+                           max_epochs: int, eta: int = 3) -> List[Dict[str, Any]]:
+        """
+        Run successive halving over the given configurations.
+
+        Args:
+            optimizer_class (Type[BaseOptimizer]): Optimizer to train
+            configs (List[Dict[str, Any]]): Candidate constructor arguments
+            min_epochs (int): Epochs of the first rung
+            max_epochs (int): Epoch cap of the last rung
+            eta (int): Promotion factor (keep the best ``1 / eta``)
+
+        Returns:
+            List[Dict[str, Any]]: Results of the last rung, best first
+        """
+        if eta < 2:
+            raise ValueError(f"eta must be >= 2, got {eta}")
+        epochs = min(min_epochs, max_epochs)
+        while True:
+            results = sorted((self.evaluate(optimizer_class, params, epochs) for params in configs),
+                             key=lambda result: result['val_cost'])
+            if epochs >= max_epochs:
+                return results
+            # The best configuration always reaches max_epochs
+            configs = [result['params'] for result in results[:max(1, len(configs) // eta)]]
+            epochs = min(epochs * eta, max_epochs)
+
+    def hyperband(self, optimizer_class: Type[BaseOptimizer], space: Dict[str, Any],
+                  max_epochs: int, eta: int = 3, min_epochs: int = 1,
+                  rng: Optional[np.random.Generator] = None) -> List[Dict[str, Any]]:
+        """
+        Run Hyperband: successive halving brackets with different trade-offs
+        between the number of configurations and their epochs.
+
+        Args:
+            optimizer_class (Type[BaseOptimizer]): Optimizer to train
+            space (Dict[str, Any]): Search space
+            max_epochs (int): Most epochs given to one configuration
+            eta (int): Promotion factor
+            min_epochs (int): Fewest epochs given to one configuration
+            rng (Optional[np.random.Generator]): Stream for sampling configs
+
+        Returns:
+            List[Dict[str, Any]]: Final results of every bracket, best first
+        """
+        rng = rng if rng is not None else np.random.default_rng(self.seed)
+        s_max = int(math.log(max_epochs / min_epochs, eta) + 1e-9)
+        finalists = []
+        for s in range(s_max, -1, -1):
+            n_configs = math.ceil((s_max + 1) / (s + 1) * eta ** s)
+            epochs = max(min_epochs, round(max_epochs / eta ** s))
+            configs = [sample_config(space, rng) for _ in range(n_configs)]
+            finalists.extend(self.successive_halving(optimizer_class, configs, epochs,
+                                                     max_epochs, eta))
+        return sorted(finalists, key=lambda result: result['val_cost'])
@@ -2,15 +2,44 @@
 Utilities package for data processing and visualization.
 """
 
-from .data_utils import prepare_iris_data, split_data, sigmoid, evaluate_model
-from .plotting import plot_convergence_curves, create_results_table, save_results_to_file
+from .data_utils import (prepare_iris_data, split_data, prepare_split_data, sigmoid,
+                         evaluate_model)
+from .plotting import (plot_convergence_curves, build_convergence_figure, save_figure,
+                       create_results_table)
+from .render import render_convergence, render_many
+from .parallel import run_parallel, SharedArrays
+from .result_cache import ResultCache
+from .result_store import ResultStore
+from .streaming import (StreamingPipeline, array_batches, file_batches, socket_batches,
+                        queue_batches, serve)
+from .metrics import (MetricsExporter, MetricsCallback, JSONLSink, PrometheusSink,
+                      peak_memory_bytes)
 
 __all__ = [
     'prepare_iris_data', 
     'split_data', 
+    'prepare_split_data',
     'sigmoid', 
     'evaluate_model',
     'plot_convergence_curves', 
+    'build_convergence_figure',
+    'save_figure',
+    'render_convergence',
+    'render_many',
     'create_results_table', 
-    'save_results_to_file'
+    'run_parallel',
+    'SharedArrays',
+    'ResultCache',
+    'ResultStore',
+    'StreamingPipeline',
+    'array_batches',
+    'file_batches',
+    'socket_batches',
+    'queue_batches',
+    'serve',
+    'MetricsExporter',
+    'MetricsCallback',
+    'JSONLSink',
+    'PrometheusSink',
+    'peak_memory_bytes'
 ]
@@ -2,17 +2,31 @@
 Utility functions for data preparation and model evaluation.
 """
 
+import hashlib
+import json
+import os
+import shutil
+import tempfile
 import numpy as np
+import sklearn
 from sklearn.datasets import load_iris
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-from typing import Tuple
+from numpy.typing import DTypeLike
+from typing import Optional, Tuple
 
+# Bump when a change to the preprocessing invalidates cached datasets
+PREPARED_DATA_VERSION = 1
+SPLIT_NAMES = ('X_train', 'X_test', 'y_train', 'y_test')
 
-def prepare_iris_data() -> Tuple[np.ndarray, np.ndarray]:
+
+def prepare_iris_data(dtype: DTypeLike = np.float64) -> Tuple[np.ndarray, np.ndarray]:
     """
     Prepare Iris dataset for binary classification.
     
+    Args:
+        dtype (DTypeLike): Floating dtype of the returned features
+    
     Returns:
         Tuple[np.ndarray, np.ndarray]: Features (with bias) and labels
     """
@@ -34,7 +48,7 @@ def prepare_iris_data() -> Tuple[np.ndarray, np.ndarray]:
     X = scaler.fit_transform(X)
     
     # Add bias term
-    X = np.c_[np.ones(X.shape[0]), X]
+    X = np.c_[np.ones(X.shape[0]), X].astype(dtype, copy=False)
     
     return X, y
 
@@ -56,6 +70,60 @@ def split_data(X: np.ndarray, y: np.ndarray, test_size: float = 0.2,
     return train_test_split(X, y, test_size=test_size, random_state=random_state, stratify=y)
 
 
+def prepare_split_data(test_size: float = 0.2, random_state: int = 42,
+                       dtype: DTypeLike = np.float64,
+                       cache_dir: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray,
+                                                                 np.ndarray, np.ndarray]:
+    """
+    Prepare and split the Iris data, reusing an on-disk cache.
+    
+    With ``cache_dir`` the split arrays are written once as ``.npy`` files
+    in a directory named by a fingerprint of the source and parameters,
+    and later calls map them with ``mmap_mode='r'`` instead of preparing
+    them again. The mapped arrays are read-only and their pages are shared
+    by every process that loads them.
+    
+    Args:
+        test_size (float): Proportion of data to use for testing
+        random_state (int): Random state for reproducibility
+        dtype (DTypeLike): Floating dtype of the features
+        cache_dir (Optional[str]): Cache directory (no caching when None)
+    
+    Returns:
+        Tuple: X_train, X_test, y_train, y_test
+    """
+    if cache_dir is None:
+        X, y = prepare_iris_data(dtype=dtype)
+        return split_data(X, y, test_size=test_size, random_state=random_state)
+    
+    fingerprint = hashlib.sha256(json.dumps({
+        'source': 'iris',
+        'sklearn': sklearn.__version__,
+        'version': PREPARED_DATA_VERSION,
+        'test_size': test_size,
+        'random_state': random_state,
+        'dtype': np.dtype(dtype).str
+    }, sort_keys=True).encode()).hexdigest()[:16]
+    directory = os.path.join(cache_dir, fingerprint)
+    
+    if not os.path.isdir(directory):
+        X, y = prepare_iris_data(dtype=dtype)
+        arrays = split_data(X, y, test_size=test_size, random_state=random_state)
+        # Write to a temporary directory and rename it into place, so that
+        # readers never see a partial cache entry
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp_')
+        for name, array in zip(SPLIT_NAMES, arrays):
+            np.save(os.path.join(tmp, f"{name}.npy"), np.ascontiguousarray(array))
+        try:
+            os.rename(tmp, directory)
+        except OSError:
+            shutil.rmtree(tmp)  # Another process wrote the entry first
+    
+    return tuple(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+                 for name in SPLIT_NAMES)
+
+
 def sigmoid(z: np.ndarray) -> np.ndarray:
     """
     Sigmoid activation function with overflow protection.
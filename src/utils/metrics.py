@@ -0,0 +1,267 @@
+"""
+Structured metrics of experiment runs, exported while they train.
+
+Records are flat dicts with an ``event`` ('epoch' or 'run'), the ``run``
+they belong to, a ``time`` stamp and numeric fields (cost, accuracies,
+samples/sec, phase seconds, memory, ...). A ``MetricsExporter`` queues
+them and a background thread writes them to its sinks, so training never
+waits for a disk or a socket:
+
+- ``JSONLSink``: one JSON object per line, appended to a file
+- ``PrometheusSink``: the latest value of every metric in the Prometheus
+  text exposition format, written to a file and/or served over HTTP
+"""
+
+import http.server
+import json
+import math
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from typing import Any, Dict, List, Optional, Sequence
+
+from optimizers.callbacks import Callback
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Queue marker that stops the writer thread
+_STOP = object()
+
+
+def peak_memory_bytes() -> Optional[int]:
+    """Return the peak resident memory of the process, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class JSONLSink:
+    """Append every record to a file as one line of JSON."""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Output file (appended to)
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Write one record."""
+        self._file.write(json.dumps(record, default=str) + '\n')
+
+    def flush(self) -> None:
+        """Push the written records to the file."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class PrometheusSink:
+    """
+    Expose the latest value of every numeric field as a Prometheus gauge.
+
+    A field ``f`` of an ``e`` record becomes the gauge ``<prefix>_e_f``
+    labelled with the run (``<prefix>_e`` when the field is named like the
+    event, as the epoch counter of epoch records). Non-numeric fields are
+    skipped.
+    """
+
+    def __init__(self, path: Optional[str] = None, port: Optional[int] = None,
+                 host: str = '127.0.0.1', prefix: str = 'gd'):
+        """
+        Args:
+            path (Optional[str]): Exposition file, rewritten atomically
+            port (Optional[int]): Serve ``/metrics`` on this port (0 picks
+                a free one, stored in ``self.port``)
+            host (str): Address of the HTTP endpoint
+            prefix (str): Prefix of the metric names
+        """
+        self.path = path
+        self.prefix = prefix
+        self.values: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self.port = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if port is not None:
+            self._serve(host, port)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Update the gauges of one record."""
+        event = record.get('event', 'event')
+        labels = '{run="%s"}' % str(record.get('run', '')).replace('\\', '\\\\').replace('"', '\\"')
+        with self._lock:
+            for field, value in record.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                if field in ('event', 'run', 'time') or not isinstance(value, (int, float)):
+                    continue
+                name = f"{self.prefix}_{event}" if field == event else f"{self.prefix}_{event}_{field}"
+                self.values.setdefault(name, {})[labels] = float(value)
+
+    def render(self) -> str:
+        """Return the gauges in the text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self.values):
+                lines.append(f"# TYPE {name} gauge")
+                for labels, value in sorted(self.values[name].items()):
+                    text = 'NaN' if math.isnan(value) else repr(value).replace('inf', 'Inf')
+                    lines.append(f"{name}{labels} {text}")
+        return '\n'.join(lines) + '\n'
+
+    def flush(self) -> None:
+        """Rewrite the exposition file (readers never see a partial file)."""
+        if self.path is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def close(self) -> None:
+        """Stop the HTTP endpoint."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _serve(self, host: str, port: int) -> None:
+        """Start the HTTP endpoint on a daemon thread."""
+        sink = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = sink.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the experiment output
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+
+class MetricsExporter:
+    """
+    Write records to the sinks on a background thread.
+
+    ``emit`` never blocks: when the queue is full the record is dropped
+    and counted in ``self.dropped``. ``close`` writes the queued records
+    and closes the sinks.
+    """
+
+    def __init__(self, sinks: Sequence[Any], maxsize: int = 10000):
+        """
+        Args:
+            sinks (Sequence[Any]): Objects with ``write``, ``flush`` and ``close``
+            maxsize (int): Records buffered between training and the writer
+        """
+        self.sinks = list(sinks)
+        self.dropped = 0
+        self.errors: List[BaseException] = []
+        self._queue = queue.Queue(maxsize)
+        self._worker = threading.Thread(target=self._write, daemon=True)
+        self._worker.start()
+
+    def emit(self, event: str, run: str, **fields: Any) -> None:
+        """
+        Queue one record.
+
+        Args:
+            event (str): Record type ('epoch' or 'run')
+            run (str): Name of the run
+            **fields: Metric values
+        """
+        try:
+            self._queue.put_nowait({'event': event, 'run': run, 'time': time.time(), **fields})
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Write the pending records, then stop the thread and the sinks."""
+        if not self._worker.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._worker.join()
+        for sink in self.sinks:
+            sink.close()
+        if self.dropped or self.errors:
+            warnings.warn(f"metrics: {self.dropped} records dropped, "
+                          f"{len(self.errors)} sink errors")
+
+    def __enter__(self) -> 'MetricsExporter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _write(self) -> None:
+        """Drain the queue in batches, flushing the sinks after each batch."""
+        while True:
+            records = [self._queue.get()]
+            while True:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = records[-1] is _STOP
+            for sink in self.sinks:
+                try:
+                    for record in records:
+                        if record is not _STOP:
+                            sink.write(record)
+                    sink.flush()
+                except Exception as exc:  # A broken sink must not stop the others
+                    self.errors.append(exc)
+            if stop:
+                return
+
+
+class MetricsCallback(Callback):
+    """Emit an 'epoch' record at the end of every epoch of a run."""
+
+    def __init__(self, exporter: MetricsExporter, run: str):
+        """
+        Args:
+            exporter (MetricsExporter): Destination of the records
+            run (str): Name of the run
+        """
+        self.exporter = exporter
+        self.run = run
+
+    def on_epoch_end(self, optimizer: Any, epoch: int, logs: Dict[str, Any]) -> None:
+        self.exporter.emit(
+            'epoch', self.run, epoch=epoch,
+            cost=None if logs['cost'] is None else float(logs['cost']),
+            samples_per_sec=logs['samples_per_sec'],
+            **{f"{phase}_seconds": seconds for phase, seconds in logs['times'].items()},
+            peak_memory_bytes=peak_memory_bytes()
+        )
@@ -0,0 +1,125 @@
+"""
+Parallel execution of independent optimizer runs in a process pool.
+"""
+
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Arrays attached by each worker process, keyed by name
+_WORKER_ARRAYS: Dict[str, np.ndarray] = {}
+_WORKER_BLOCKS: List[shared_memory.SharedMemory] = []
+
+
+class SharedArrays:
+    """
+    Copy NumPy arrays into shared memory blocks once for a pool of workers.
+
+    Workers receive only the block names, shapes and dtypes and map the
+    same pages instead of unpickling a copy of the data for every task.
+    Use as a context manager so the blocks are released afterwards.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            arrays (Dict[str, np.ndarray]): Arrays to share, keyed by name
+        """
+        self.blocks = []
+        self.specs = {}
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.specs[key] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release and unlink every shared block."""
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def _attach_arrays(specs: Dict[str, Tuple[str, tuple, str]]) -> None:
+    """Pool initializer: map the shared blocks into this worker once."""
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        _WORKER_BLOCKS.append(block)
+        _WORKER_ARRAYS[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+
+def _run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Train one optimizer on the shared data and evaluate it.
+
+    Args:
+        job (Dict[str, Any]): Optimizer class, constructor params, random
+            stream, epochs, batch size and extra ``optimize`` arguments
+
+    Returns:
+        Dict[str, Any]: The job label with weights, costs, training
+        seconds and accuracies
+    """
+    X_train, y_train = _WORKER_ARRAYS['X_train'], _WORKER_ARRAYS['y_train']
+    X_test, y_test = _WORKER_ARRAYS['X_test'], _WORKER_ARRAYS['y_test']
+
+    fit_params = dict(job['fit_params'])
+    if fit_params.get('patience') is not None:
+        # Validation-based early stopping monitors the shared test split
+        fit_params.update(X_val=X_test, y_val=y_test)
+    
+    optimizer = job['optimizer_class'](**job['params'], rng=job['rng'])
+    start = time.perf_counter()
+    weights, costs = optimizer.optimize(X_train, y_train, job['epochs'],
+                                        batch_size=job['batch_size'], **fit_params)
+    seconds = time.perf_counter() - start
+
+    return {
+        'label': job['label'],
+        'weights': weights,
+        'costs': costs,
+        'seconds': seconds,
+        'train_accuracy': optimizer.evaluate_accuracy(weights, X_train, y_train),
+        'test_accuracy': optimizer.evaluate_accuracy(weights, X_test, y_test),
+        'optimizer': optimizer
+    }
+
+
+def run_parallel(jobs: List[Dict[str, Any]], arrays: Dict[str, np.ndarray],
+                 max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Run optimizer jobs in a process pool over shared training data.
+
+    Results are yielded as soon as each job finishes, so a caller can
+    report a run while the others are still training.
+
+    Args:
+        jobs (List[Dict[str, Any]]): Jobs with keys 'label',
+            'optimizer_class', 'params', 'rng', 'epochs', 'batch_size' and
+            'fit_params'
+        arrays (Dict[str, np.ndarray]): 'X_train', 'y_train', 'X_test'
+            and 'y_test'
+        max_workers (Optional[int]): Pool size (defaults to the CPU count)
+
+    Yields:
+        Dict[str, Any]: The result of each job (with its 'label'), in the
+        order the jobs finish
+    """
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs)) or 1
+    with SharedArrays(arrays) as shared:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_arrays,
+                                 initargs=(shared.specs,)) as pool:
+            futures = [pool.submit(_run_job, job) for job in jobs]
+            for future in as_completed(futures):
+                yield future.result()
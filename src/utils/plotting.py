@@ -2,54 +2,113 @@
 Plotting utilities for visualization.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
-from typing import Dict, List, Optional
+from matplotlib.figure import Figure
+from typing import Dict, List, Optional, Sequence, Union
 import os
 
 
-def plot_convergence_curves(costs_dict: Dict[str, List[float]], 
-                          save_path: Optional[str] = None,
-                          title: str = "Convergencia de Métodos de Optimización - Dataset Iris",
-                          figsize: tuple = (10, 6)) -> None:
+def build_convergence_figure(costs_dict: Dict[str, List[float]],
+                             title: str = "Convergencia de Métodos de Optimización - Dataset Iris",
+                             figsize: tuple = (10, 6), fig: Optional[Figure] = None,
+                             epochs_dict: Optional[Dict[str, List[int]]] = None) -> Figure:
     """
-    Plot convergence curves for different optimizers.
+    Build the convergence figure without touching pyplot.
+    
+    Unless ``fig`` is given, the figure is not registered with any GUI
+    backend, so it can be built and saved on headless machines and in
+    worker processes.
     
     Args:
         costs_dict (Dict[str, List[float]]): Dictionary with method names and their cost histories
-        save_path (Optional[str]): Path to save the figure
         title (str): Title for the plot
         figsize (tuple): Figure size
+        fig (Optional[Figure]): Existing figure to draw into
+        epochs_dict (Optional[Dict[str, List[int]]]): Epoch of each recorded
+            cost per method (defaults to one cost per epoch)
+        
+    Returns:
+        Figure: The finished figure
     """
-    plt.figure(figsize=figsize)
-    plt.rcParams.update({'font.size': 12})
+    if fig is None:
+        fig = Figure(figsize=figsize)
+    ax = fig.add_subplot()
     
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
     linestyles = ['-', '--', '-.', ':']
     markers = ['o', 's', '^', 'D']
     
+    epochs_dict = {method: (epochs_dict or {}).get(method, range(1, len(costs) + 1))
+                   for method, costs in costs_dict.items()}
     for i, (method, costs) in enumerate(costs_dict.items()):
-        plt.plot(range(1, len(costs) + 1), costs, 
+        ax.plot(epochs_dict[method], costs, 
                 color=colors[i % len(colors)], 
                 linestyle=linestyles[i % len(linestyles)], 
                 linewidth=2.5, label=method, 
                 marker=markers[i % len(markers)], 
                 markersize=5, markevery=3)
     
-    plt.xlabel('Época', fontsize=14)
-    plt.ylabel('Función de Costo (Pérdida)', fontsize=14)
-    plt.title(title, fontsize=16)
-    plt.legend(fontsize=12, loc='upper right')
-    plt.grid(True, alpha=0.3)
-    plt.xlim(1, len(list(costs_dict.values())[0]))
+    ax.tick_params(labelsize=12)
+    ax.set_xlabel('Época', fontsize=14)
+    ax.set_ylabel('Función de Costo (Pérdida)', fontsize=14)
+    ax.set_title(title, fontsize=16)
+    ax.legend(fontsize=12, loc='upper right')
+    ax.grid(True, alpha=0.3)
+    ax.set_xlim(1, max(max(epochs, default=1) for epochs in epochs_dict.values()))
+    return fig
+
+
+def save_figure(fig: Figure, paths: Union[str, Sequence[str]], dpi: int = 300) -> None:
+    """
+    Save one figure to every path, in the format given by its extension.
+    
+    Args:
+        fig (Figure): Figure to save
+        paths (Union[str, Sequence[str]]): Output files (.pdf, .png, .svg, ...)
+        dpi (int): Resolution of raster formats
+    """
+    for path in [paths] if isinstance(paths, str) else paths:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fig.savefig(path, dpi=dpi, bbox_inches='tight')
+
+
+def plot_convergence_curves(costs_dict: Dict[str, List[float]], 
+                          save_path: Optional[Union[str, Sequence[str]]] = None,
+                          title: str = "Convergencia de Métodos de Optimización - Dataset Iris",
+                          figsize: tuple = (10, 6), show: bool = False,
+                          epochs_dict: Optional[Dict[str, List[int]]] = None) -> None:
+    """
+    Plot convergence curves for different optimizers.
+    
+    The figure is built once and saved to every path in ``save_path``; the
+    format of each file follows its extension.
+    
+    Args:
+        costs_dict (Dict[str, List[float]]): Dictionary with method names and their cost histories
+        save_path (Optional[Union[str, Sequence[str]]]): Path or paths to save the figure
+        title (str): Title for the plot
+        figsize (tuple): Figure size
+        show (bool): Also open the figure in an interactive window
+        epochs_dict (Optional[Dict[str, List[int]]]): Epoch of each recorded
+            cost per method (defaults to one cost per epoch)
+    """
+    fig = None
+    if show:
+        # pyplot (and a GUI backend) only when a window is requested
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=figsize)
+    fig = build_convergence_figure(costs_dict, title=title, figsize=figsize, fig=fig,
+                                   epochs_dict=epochs_dict)
     
     if save_path:
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        plt.savefig(save_path, format='pdf', dpi=300, bbox_inches='tight')
-        print(f"Gráfico guardado en: {save_path}")
+        save_figure(fig, save_path)
+        for path in [save_path] if isinstance(save_path, str) else save_path:
+            print(f"Gráfico guardado en: {path}")
     
-    plt.show()
+    if show:
+        plt.show()
 
 
 def create_results_table(results: Dict[str, Dict]) -> None:
@@ -70,45 +129,3 @@ def create_results_table(results: Dict[str, Dict]) -> None:
               f"{result['train_accuracy']:<18.2%} {result['test_accuracy']:<15.2%}")
     
     print("-" * 80)
-
-
-def save_results_to_file(results: Dict[str, Dict], costs_dict: Dict[str, List[float]], 
-                        filepath: str) -> None:
-    """
-    Save experiment results to a text file.
-    
-    Args:
-        results (Dict[str, Dict]): Results dictionary
-        costs_dict (Dict[str, List[float]]): Cost histories
-        filepath (str): Path to save the results file
-    """
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write("RESULTADOS DEL EXPERIMENTO DE OPTIMIZACIÓN\n")
-        f.write("=" * 50 + "\n\n")
-        
-        f.write("Configuración del Experimento:\n")
-        f.write("- Dataset: Iris (Versicolor vs Virginia)\n")
-        f.write("- Características: 4 features + bias term\n")
-        f.write("- División: 80% entrenamiento, 20% prueba\n")
-        f.write("- Épocas: 30\n\n")
-        
-        f.write("Resultados Finales:\n")
-        f.write("-" * 30 + "\n")
-        for method_name, result in results.items():
-            f.write(f"{method_name}:\n")
-            f.write(f"  - Costo Final: {result['final_cost']:.4f}\n")
-            f.write(f"  - Precisión Entrenamiento: {result['train_accuracy']:.2%}\n")
-            f.write(f"  - Precisión Prueba: {result['test_accuracy']:.2%}\n\n")
-        
-        f.write("Historial de Costos por Época:\n")
-        f.write("-" * 30 + "\n")
-        epochs = len(list(costs_dict.values())[0])
-        f.write("Época\t" + "\t".join(costs_dict.keys()) + "\n")
-        for epoch in range(epochs):
-            f.write(f"{epoch+1}\t")
-            f.write("\t".join([f"{costs[epoch]:.4f}" for costs in costs_dict.values()]))
-            f.write("\n")
-    
-    print(f"Resultados guardados en: {filepath}")
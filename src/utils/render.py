@@ -0,0 +1,127 @@
+"""
+Headless rendering of convergence figures, in parallel and only when needed.
+
+A render job describes one figure (cost histories, title, size) and every
+file it is saved to. The figure is built once per job and saved to all of
+its paths; the format of each file follows its extension. Next to every
+output a hidden stamp file records the hash of the data and settings it
+was rendered from, so unchanged figures are not rendered again. Several
+jobs are rendered by a process pool; no GUI backend is ever loaded.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import matplotlib
+
+from .plotting import build_convergence_figure, save_figure
+from .result_cache import hash_array
+
+# Bump when a change to the figure code should re-render every figure
+RENDER_VERSION = 1
+
+
+def render_key(job: Dict[str, Any]) -> str:
+    """
+    Hash everything a rendered figure depends on.
+
+    Args:
+        job (Dict[str, Any]): Render job (see ``render_convergence``)
+
+    Returns:
+        str: Hex digest
+    """
+    description = json.dumps({
+        'version': RENDER_VERSION,
+        'matplotlib': matplotlib.__version__,
+        'title': job.get('title'),
+        'figsize': list(job.get('figsize', (10, 6))),
+        'dpi': job.get('dpi', 300),
+        'costs': [(name, hash_array(np.asarray(costs, dtype=np.float64)))
+                  for name, costs in job['costs'].items()],
+        'epochs': {name: list(map(int, epochs)) for name, epochs in job.get('epochs', {}).items()}
+    }, sort_keys=True)
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def stamp_path(path: str) -> str:
+    """Return the hidden stamp file of an output."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f".{name}.render")
+
+
+def is_current(path: str, key: str) -> bool:
+    """Whether ``path`` exists and was rendered from ``key``."""
+    try:
+        with open(stamp_path(path), 'r', encoding='utf-8') as f:
+            return f.read() == key and os.path.exists(path)
+    except FileNotFoundError:
+        return False
+
+
+def render_convergence(job: Dict[str, Any], force: bool = False) -> bool:
+    """
+    Render one figure to every path of a job, unless all are up to date.
+
+    A job is a dict with ``costs`` (method name -> cost history),
+    ``paths`` and optionally ``epochs`` (method name -> epoch of each
+    recorded cost), ``title``, ``figsize`` and ``dpi``.
+
+    Args:
+        job (Dict[str, Any]): Render job
+        force (bool): Render even if the stamps match
+
+    Returns:
+        bool: Whether the figure was rendered
+    """
+    key = render_key(job)
+    if not force and all(is_current(path, key) for path in job['paths']):
+        return False
+
+    kwargs = {name: job[name] for name in ('title', 'figsize') if name in job}
+    fig = build_convergence_figure(job['costs'], epochs_dict=job.get('epochs'), **kwargs)
+    save_figure(fig, job['paths'], dpi=job.get('dpi', 300))
+    # Stamps are written last: an interrupted render is redone next time
+    for path in job['paths']:
+        with open(stamp_path(path), 'w', encoding='utf-8') as f:
+            f.write(key)
+    return True
+
+
+def _render_job(job: Dict[str, Any]) -> bool:
+    """Render one job in a worker process."""
+    return render_convergence(job, force=True)
+
+
+def render_many(jobs: Sequence[Dict[str, Any]], max_workers: Optional[int] = None,
+                force: bool = False) -> List[bool]:
+    """
+    Render several figures, in worker processes when there are many.
+
+    Up-to-date figures are skipped before any worker is started.
+
+    Args:
+        jobs (Sequence[Dict[str, Any]]): Render jobs
+        max_workers (Optional[int]): Number of worker processes (defaults
+            to the CPU count; 1 renders in this process)
+        force (bool): Render even if the stamps match
+
+    Returns:
+        List[bool]: Whether each figure was rendered (False when skipped)
+    """
+    pending = [i for i, job in enumerate(jobs)
+               if force or not all(is_current(path, render_key(job)) for path in job['paths'])]
+    rendered = [False] * len(jobs)
+    workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    if workers <= 1:
+        outputs = [_render_job(jobs[i]) for i in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(_render_job, [jobs[i] for i in pending]))
+    for i, output in zip(pending, outputs):
+        rendered[i] = output
+    return rendered
@@ -0,0 +1,124 @@
+"""
+On-disk cache of experiment results keyed by a hash of their inputs.
+
+Every entry is one ``.npz`` file named after the hash of everything that
+determines a run (data, optimizer class and hyperparameters, epochs, seed
+and training settings), so changing any input only misses the entries
+that depend on it. The total size is bounded by evicting the least
+recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from typing import Any, Dict, Optional
+
+from optimizers.checkpoint import save_checkpoint, load_checkpoint
+
+# Bump when a change to the training code invalidates stored results
+CACHE_VERSION = 1
+
+
+def hash_array(array: np.ndarray) -> str:
+    """Return a hash of the dtype, shape and contents of an array."""
+    array = np.ascontiguousarray(array)
+    digest = hashlib.sha256(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(array.data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Size-bounded LRU cache of run results stored as ``.npz`` files.
+
+    A result is a dict of arrays (weights, cost history) and JSON values
+    (accuracies, stop reason, ...). Reading an entry marks it as recently
+    used by touching its modification time.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 2 ** 20):
+        """
+        Args:
+            directory (str): Cache directory (created if needed)
+            max_bytes (int): Largest total size of the entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(**inputs: Any) -> str:
+        """
+        Hash the inputs of a run into a cache key.
+
+        Arrays are hashed by content; other values must be JSON-serializable
+        (or are converted with ``str``).
+
+        Args:
+            **inputs: Everything that determines the result
+
+        Returns:
+            str: Hex digest
+        """
+        normalized = {name: hash_array(value) if isinstance(value, np.ndarray) else value
+                      for name, value in inputs.items()}
+        description = json.dumps({'version': CACHE_VERSION, **normalized},
+                                 sort_keys=True, default=str)
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        """Return the file of an entry."""
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[Dict[str, Any]]: The stored result, or None on a miss
+        """
+        path = self.path(key)
+        try:
+            arrays, meta = load_checkpoint(path)
+            os.utime(path)
+        except (FileNotFoundError, ValueError, KeyError, OSError):
+            return None
+        return {**meta, **arrays}
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store an entry and evict old ones if the cache is too large.
+
+        Args:
+            key (str): Cache key
+            result (Dict[str, Any]): Arrays and JSON-serializable values
+        """
+        arrays = {name: value for name, value in result.items() if isinstance(value, np.ndarray)}
+        meta = {name: value.item() if isinstance(value, np.generic) else value
+                for name, value in result.items() if name not in arrays}
+        save_checkpoint(self.path(key), arrays, meta)
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the size fits."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                os.remove(os.path.join(self.directory, name))
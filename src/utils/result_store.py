@@ -0,0 +1,249 @@
+"""
+Append-only columnar store of experiment runs.
+
+Every column is a raw binary file of fixed-width values, so loading maps
+the files with ``np.memmap`` instead of parsing anything:
+
+- numeric columns (seed, epochs, costs, accuracies, ...) hold the values
+- text columns (optimizer, label, config, stop reason) hold int32 codes
+  into category lists kept in ``manifest.json``
+- ``costs.bin`` concatenates the full-precision cost histories, which may
+  have any length; each run points to its slice with an offset and length
+- ``cost_epochs.bin`` holds the epoch of every cost, aligned with ``costs.bin``
+
+Appends write past the committed end of every column, fsync them, and
+only then replace the manifest (which records the number of committed
+runs and costs) atomically, so an interrupted append is ignored and
+overwritten by the next one. The store assumes a single writer.
+"""
+
+import json
+import os
+import tempfile
+import time
+import numpy as np
+from typing import Any, Dict, List, Sequence
+
+# Bump when the layout of the columns changes
+STORE_VERSION = 2
+
+NUMERIC_COLUMNS = {
+    'seed': np.int64,
+    'epochs': np.int64,
+    'epochs_run': np.int64,
+    'batch_size': np.int64,
+    'final_cost': np.float64,
+    'train_accuracy': np.float64,
+    'test_accuracy': np.float64,
+    'seconds': np.float64,
+    'timestamp': np.float64,
+    'cost_offset': np.int64,
+    'cost_length': np.int64
+}
+CATEGORICAL_COLUMNS = ('optimizer', 'label', 'config', 'stop_reason')
+CODE_DTYPE = np.int32
+COST_DTYPE = np.float64
+EPOCH_DTYPE = np.int64
+
+# Values stored for fields a run does not provide
+MISSING = {np.int64: -1, np.float64: np.nan}
+
+
+class ResultStore:
+    """
+    Columnar store of run metadata and cost histories.
+
+    A run is a dict with ``optimizer``, ``label``, ``config`` (the
+    optimizer hyperparameters), ``seed``, ``epochs``, ``epochs_run``,
+    ``batch_size``, ``stop_reason``, ``final_cost``, ``train_accuracy``,
+    ``test_accuracy``, ``seconds``, ``costs`` and ``cost_epochs`` (the
+    epoch of each cost, one per epoch by default); missing fields are
+    stored as -1, NaN or an empty string.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Store directory (created if needed)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = self._read_manifest()
+
+    def __len__(self) -> int:
+        return self.manifest['n_runs']
+
+    def column_path(self, name: str) -> str:
+        """Return the file of a column."""
+        return os.path.join(self.directory, f"{name}.bin")
+
+    def append(self, runs: Sequence[Dict[str, Any]]) -> None:
+        """
+        Append runs to the store.
+
+        Args:
+            runs (Sequence[Dict[str, Any]]): Runs to add
+        """
+        if not runs:
+            return
+        manifest = self._read_manifest()
+        categories = manifest['categories']
+        n_runs, n_costs = manifest['n_runs'], manifest['n_costs']
+
+        histories = [np.asarray(run.get('costs', ()), dtype=COST_DTYPE) for run in runs]
+        lengths = np.array([len(costs) for costs in histories], dtype=np.int64)
+        epochs = []
+        for run, costs in zip(runs, histories):
+            cost_epochs = run.get('cost_epochs')
+            cost_epochs = (np.arange(1, len(costs) + 1) if cost_epochs is None
+                           else np.asarray(cost_epochs, dtype=EPOCH_DTYPE))
+            if len(cost_epochs) != len(costs):
+                raise ValueError(f"run {run.get('label')!r} has {len(costs)} costs "
+                                 f"but {len(cost_epochs)} cost epochs")
+            epochs.append(cost_epochs)
+        columns = {
+            'timestamp': np.full(len(runs), time.time()),
+            'cost_offset': n_costs + np.concatenate(([0], np.cumsum(lengths)[:-1])),
+            'cost_length': lengths
+        }
+        for name, dtype in NUMERIC_COLUMNS.items():
+            if name not in columns:
+                columns[name] = np.array([MISSING[dtype] if run.get(name) is None else run[name]
+                                          for run in runs], dtype=dtype)
+        for name in CATEGORICAL_COLUMNS:
+            index = {value: code for code, value in enumerate(categories[name])}
+            codes = []
+            for run in runs:
+                value = run.get(name)
+                if name == 'config':
+                    value = json.dumps(value or {}, sort_keys=True, default=str)
+                value = '' if value is None else str(value)
+                if value not in index:
+                    index[value] = len(categories[name])
+                    categories[name].append(value)
+                codes.append(index[value])
+            columns[name] = np.array(codes, dtype=CODE_DTYPE)
+
+        self._write_column('costs', np.concatenate(histories), n_costs)
+        self._write_column('cost_epochs', np.concatenate(epochs).astype(EPOCH_DTYPE), n_costs)
+        for name, values in columns.items():
+            self._write_column(name, values, n_runs)
+        manifest.update(n_runs=n_runs + len(runs), n_costs=n_costs + int(lengths.sum()))
+        self._write_manifest(manifest)
+        self.manifest = manifest
+
+    def load(self, **filters: Any) -> Dict[str, Any]:
+        """
+        Load the runs matching every filter.
+
+        A filter on a column takes one value or a list of values;
+        ``config`` takes a dict and matches the runs whose configuration
+        contains its items (e.g. ``config={'learning_rate': 0.05}``).
+
+        Args:
+            **filters: Column filters, e.g. ``optimizer='Adam', seed=[1, 2]``
+
+        Returns:
+            Dict[str, Any]: One array per column (text columns decoded,
+            ``config`` as a list of dicts), ``costs``, the list of cost
+            histories as read-only views of the mapped file, and
+            ``cost_epochs``, the matching epochs
+        """
+        self.manifest = self._read_manifest()
+        n_runs = self.manifest['n_runs']
+        categories = self.manifest['categories']
+        unknown = set(filters) - set(NUMERIC_COLUMNS) - set(CATEGORICAL_COLUMNS)
+        if unknown:
+            raise ValueError(f"unknown columns: {sorted(unknown)}")
+
+        columns = {name: self._map_column(name, dtype, n_runs)
+                   for name, dtype in NUMERIC_COLUMNS.items()}
+        columns.update({name: self._map_column(name, CODE_DTYPE, n_runs)
+                        for name in CATEGORICAL_COLUMNS})
+        mask = np.ones(n_runs, dtype=bool)
+        for name, wanted in filters.items():
+            if name == 'config':
+                configs = [json.loads(config) for config in categories['config']]
+                wanted = [code for code, config in enumerate(configs)
+                          if all(config.get(key) == value for key, value in wanted.items())]
+            else:
+                wanted = wanted if isinstance(wanted, (list, tuple, set, np.ndarray)) else [wanted]
+                if name in CATEGORICAL_COLUMNS:
+                    wanted = [categories[name].index(value) for value in wanted
+                              if value in categories[name]]
+            mask &= np.isin(columns[name], list(wanted))
+        rows = np.flatnonzero(mask)
+
+        result = {name: np.asarray(columns[name][rows]) for name in NUMERIC_COLUMNS}
+        for name in CATEGORICAL_COLUMNS:
+            codes = columns[name][rows]
+            if name == 'config':
+                result[name] = [json.loads(categories[name][code]) for code in codes]
+            else:
+                result[name] = np.array(categories[name], dtype=str)[codes]
+        slices = [slice(offset, offset + length) for offset, length
+                  in zip(result['cost_offset'], result['cost_length'])]
+        costs = self._map_column('costs', COST_DTYPE, self.manifest['n_costs'])
+        cost_epochs = self._map_column('cost_epochs', EPOCH_DTYPE, self.manifest['n_costs'])
+        result['costs'] = [costs[part] for part in slices]
+        result['cost_epochs'] = [cost_epochs[part] for part in slices]
+        return result
+
+    @staticmethod
+    def cost_matrix(costs: List[np.ndarray], fill: float = np.nan) -> np.ndarray:
+        """
+        Stack cost histories of varying length into a padded matrix.
+
+        Args:
+            costs (List[np.ndarray]): Cost histories (as returned by ``load``)
+            fill (float): Value after the end of shorter histories
+
+        Returns:
+            np.ndarray: Runs x longest history
+        """
+        matrix = np.full((len(costs), max((len(c) for c in costs), default=0)), fill)
+        for row, history in enumerate(costs):
+            matrix[row, :len(history)] = history
+        return matrix
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        """Return the committed manifest (an empty one for a new store)."""
+        try:
+            with open(os.path.join(self.directory, 'manifest.json'), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {'version': STORE_VERSION, 'n_runs': 0, 'n_costs': 0,
+                    'categories': {name: [] for name in CATEGORICAL_COLUMNS}}
+        if manifest['version'] != STORE_VERSION:
+            raise ValueError(f"unsupported result store version {manifest['version']}")
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Replace the manifest atomically."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.directory, 'manifest.json'))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def _write_column(self, name: str, values: np.ndarray, committed: int) -> None:
+        """Write ``values`` after the first ``committed`` entries of a column."""
+        path = self.column_path(name)
+        with open(path, 'r+b' if os.path.exists(path) else 'wb') as f:
+            # Drop the leftovers of an interrupted append
+            f.truncate(committed * values.itemsize)
+            f.seek(committed * values.itemsize)
+            f.write(np.ascontiguousarray(values).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _map_column(self, name: str, dtype: Any, length: int) -> np.ndarray:
+        """Map the committed entries of a column (read-only)."""
+        if length == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self.column_path(name), dtype=dtype, mode='r', shape=(length,))
@@ -0,0 +1,250 @@
+"""
+Asyncio pipeline streaming labelled batches into the optimizers.
+
+Sources are async iterators of ``(X_batch, y_batch)`` pairs. A producer
+task moves batches from a source into a bounded queue, which suspends the
+producer while training is behind (backpressure), and a consumer task
+trains every model on each batch with ``partial_fit``. The updates run in
+a worker thread, so the event loop keeps reading input in the meantime
+and several pipelines can share one process.
+"""
+
+import asyncio
+import numpy as np
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+Batch = Tuple[np.ndarray, np.ndarray]
+
+# Queue marker for the end of a stream
+_END = object()
+
+
+def parse_rows(lines: Sequence[str], dtype: Any = np.float64) -> Batch:
+    """
+    Parse CSV rows ``x_1,...,x_n,label`` into features and labels.
+
+    Args:
+        lines (Sequence[str]): Text rows
+        dtype (Any): Dtype of the parsed arrays
+
+    Returns:
+        Batch: Features (b x n) and labels (b,)
+    """
+    data = np.array([line.strip().split(',') for line in lines], dtype=dtype)
+    return data[:, :-1], data[:, -1]
+
+
+async def array_batches(X: np.ndarray, y: np.ndarray, batch_size: int = 32) -> AsyncIterator[Batch]:
+    """
+    Stream in-memory arrays in consecutive batches.
+
+    Args:
+        X (np.ndarray): Features
+        y (np.ndarray): Labels
+        batch_size (int): Rows per batch
+
+    Yields:
+        Batch: Features and labels of one batch
+    """
+    for start in range(0, len(y), batch_size):
+        yield X[start:start + batch_size], y[start:start + batch_size]
+        await asyncio.sleep(0)  # Let other tasks run between batches
+
+
+async def file_batches(path: str, batch_size: int = 32,
+                       dtype: Any = np.float64) -> AsyncIterator[Batch]:
+    """
+    Stream a CSV file of ``x_1,...,x_n,label`` rows without blocking the loop.
+
+    Args:
+        path (str): File to read
+        batch_size (int): Rows per batch
+        dtype (Any): Dtype of the parsed arrays
+
+    Yields:
+        Batch: Features and labels of one batch
+    """
+    f = await asyncio.to_thread(open, path, 'r', encoding='utf-8')
+    try:
+        while True:
+            lines = await asyncio.to_thread(lambda: list(islice(f, batch_size)))
+            if not lines:
+                break
+            yield parse_rows(lines, dtype)
+    finally:
+        f.close()
+
+
+async def socket_batches(host: str, port: int, batch_size: int = 32,
+                         dtype: Any = np.float64) -> AsyncIterator[Batch]:
+    """
+    Stream newline-delimited CSV rows received over a TCP connection.
+
+    Args:
+        host (str): Server address
+        port (int): Server port
+        batch_size (int): Rows per batch (a shorter batch is flushed at EOF)
+        dtype (Any): Dtype of the parsed arrays
+
+    Yields:
+        Batch: Features and labels of one batch
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                lines.append(line.decode())
+            if len(lines) == batch_size:
+                yield parse_rows(lines, dtype)
+                lines = []
+        if lines:
+            yield parse_rows(lines, dtype)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def queue_batches(queue: asyncio.Queue) -> AsyncIterator[Batch]:
+    """
+    Stream batches published to a local queue (a message-queue stand-in).
+
+    Publishers put ``(X_batch, y_batch)`` pairs and finally ``None``.
+
+    Args:
+        queue (asyncio.Queue): Queue of batches
+
+    Yields:
+        Batch: Features and labels of one batch
+    """
+    while True:
+        batch = await queue.get()
+        if batch is None:
+            break
+        yield batch
+
+
+class StreamingPipeline:
+    """
+    Train several optimizers online from one asynchronous source.
+
+    ``stop()`` ends the stream gracefully: no new batch is read from the
+    source, and the batches already queued are still trained on before
+    ``run`` returns.
+    """
+
+    def __init__(self, optimizers: Dict[str, Any], maxsize: int = 8):
+        """
+        Args:
+            optimizers (Dict[str, Any]): Optimizers to train, keyed by name
+            maxsize (int): Batches buffered between reading and training
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        self.optimizers = optimizers
+        self.maxsize = maxsize
+        self.losses = {name: [] for name in optimizers}
+        self.n_batches = 0
+        self.n_samples = 0
+        self._stopping: Optional[asyncio.Event] = None
+
+    def stop(self) -> None:
+        """Stop reading new batches and drain the queue (call from the loop)."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def run(self, source: AsyncIterator[Batch]) -> Dict[str, List[float]]:
+        """
+        Consume ``source`` until it ends or ``stop()`` is called.
+
+        Args:
+            source (AsyncIterator[Batch]): Async iterator of batches
+
+        Returns:
+            Dict[str, List[float]]: Loss of every batch, per optimizer
+        """
+        self._stopping = asyncio.Event()
+        queue = asyncio.Queue(self.maxsize)
+        producer = asyncio.create_task(self._produce(source, queue))
+        try:
+            await self._consume(queue)
+        except BaseException:
+            producer.cancel()
+            raise
+        await producer  # Re-raises errors of the source
+        return self.losses
+
+    async def _produce(self, source: AsyncIterator[Batch], queue: asyncio.Queue) -> None:
+        """Move batches from the source to the queue, then mark the end."""
+        error = None
+        iterator = source.__aiter__()
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        read = None
+        try:
+            while True:
+                # Race the next read against stop(), so an idle source
+                # cannot keep the pipeline waiting
+                read = asyncio.ensure_future(iterator.__anext__())
+                await asyncio.wait({read, stopping}, return_when=asyncio.FIRST_COMPLETED)
+                if self._stopping.is_set():
+                    if read.done() and not read.cancelled():
+                        read.exception()  # A batch read before stop() is dropped
+                    break
+                try:
+                    batch = read.result()
+                except StopAsyncIteration:
+                    break
+                await queue.put(batch)
+        except Exception as exc:
+            error = exc
+        finally:
+            stopping.cancel()
+            if read is not None and not read.done():
+                read.cancel()
+                try:
+                    await read
+                except (asyncio.CancelledError, StopAsyncIteration):
+                    pass
+                except Exception as exc:  # The source failed while closing
+                    error = error or exc
+            if hasattr(source, 'aclose'):
+                await source.aclose()
+        # Reached at the end of the source, after stop() and on source
+        # errors, but not on cancellation (the consumer is gone then)
+        await queue.put(_END)
+        if error is not None:
+            raise error
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        """Train on queued batches until the end marker."""
+        while True:
+            batch = await queue.get()
+            if batch is _END:
+                return
+            await asyncio.to_thread(self._train, *batch)
+
+    def _train(self, X_batch: np.ndarray, y_batch: np.ndarray) -> None:
+        """Update every optimizer with one batch."""
+        for name, optimizer in self.optimizers.items():
+            self.losses[name].append(optimizer.partial_fit(X_batch, y_batch))
+        self.n_batches += 1
+        self.n_samples += len(y_batch)
+
+
+async def serve(streams: Sequence[Tuple[StreamingPipeline, AsyncIterator[Batch]]]
+                ) -> List[Dict[str, List[float]]]:
+    """
+    Run several pipelines concurrently in the current event loop.
+
+    Args:
+        streams (Sequence[Tuple[StreamingPipeline, AsyncIterator[Batch]]]):
+            Pipelines with the source each one consumes
+
+    Returns:
+        List[Dict[str, List[float]]]: Batch losses of each pipeline
+    """
+    return await asyncio.gather(*(pipeline.run(source) for pipeline, source in streams))
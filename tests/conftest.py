@@ -0,0 +1,48 @@
+"""
+Shared fixtures of the test suite.
+
+The tests import the packages under ``src`` the way ``main.py`` does.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from optimizers import SGD, SGDMomentum, RMSProp, Adam  # noqa: E402
+
+OPTIMIZERS = {
+    'SGD': (SGD, {'learning_rate': 0.05}),
+    'SGDMomentum': (SGDMomentum, {'learning_rate': 0.03, 'momentum': 0.9}),
+    'RMSProp': (RMSProp, {'learning_rate': 0.05, 'rho': 0.9}),
+    'Adam': (Adam, {'learning_rate': 0.05})
+}
+
+
+@pytest.fixture(params=sorted(OPTIMIZERS))
+def make_optimizer(request):
+    """Factory of each optimizer with the learning rates of the experiments."""
+    optimizer_class, defaults = OPTIMIZERS[request.param]
+    return lambda **kwargs: optimizer_class(**{**defaults, **kwargs})
+
+
+@pytest.fixture
+def iris():
+    """Training split of the Iris problem used by the experiments."""
+    from utils import prepare_iris_data, split_data
+    X, y = prepare_iris_data()
+    X_train, _, y_train, _ = split_data(X, y)
+    return X_train, y_train
+
+
+@pytest.fixture
+def sparse_problem():
+    """Wide binary problem whose features are mostly zeros (bias column first)."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 30)) * (rng.random((400, 30)) < 0.2)
+    X[:, 0] = 1
+    y = (X[:, 1] + X[:, 2] > 0).astype(float)
+    return X, y
@@ -0,0 +1,24 @@
+"""
+Training in float32 must follow the float64 trajectory closely.
+"""
+
+import numpy as np
+
+
+def test_float32_costs_match_float64(make_optimizer, iris):
+    X, y = iris
+    w64, costs64 = make_optimizer(seed=42).optimize(X, y, epochs=30, dtype=np.float64)
+    w32, costs32 = make_optimizer(seed=42).optimize(X, y, epochs=30, dtype=np.float32)
+
+    assert w64.dtype == np.float64
+    assert w32.dtype == np.float32
+    np.testing.assert_allclose(costs32, costs64, rtol=1e-5, atol=1e-6)
+
+
+def test_partial_fit_casts_batches_to_weight_dtype(make_optimizer, iris):
+    X, y = iris
+    optimizer = make_optimizer(seed=0)
+    optimizer.init(X.shape[1], dtype=np.float32)
+    optimizer.partial_fit(X[:8], y[:8])
+
+    assert optimizer.weights.dtype == np.float32
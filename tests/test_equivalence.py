@@ -0,0 +1,110 @@
+"""
+Equivalence of the training drivers with each other and with the original
+per-sample training loops.
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from optimizers import Adam
+
+
+def reference_optimize(optimizer, X, y, epochs):
+    """
+    The per-sample loops of the first version of the optimizers.
+
+    Draws from the global ``np.random`` state, as they did.
+    """
+    m, n = X.shape
+    w = np.random.normal(0, 0.01, n)
+    first = np.zeros(n)
+    second = np.zeros(n)
+    t = 0
+    for _ in range(epochs):
+        for i in np.random.permutation(m):
+            t += 1
+            grad = (optimizer.sigmoid(X[i].dot(w)) - y[i]) * X[i]
+            if optimizer.name == 'SGD':
+                w = w - optimizer.learning_rate * grad
+            elif optimizer.name == 'SGD + Momentum':
+                first = optimizer.momentum * first + optimizer.learning_rate * grad
+                w = w - first
+            elif optimizer.name == 'RMSProp':
+                second = optimizer.rho * second + (1 - optimizer.rho) * (grad ** 2)
+                w = w - (optimizer.learning_rate / (np.sqrt(second) + optimizer.epsilon)) * grad
+            else:
+                first = optimizer.beta1 * first + (1 - optimizer.beta1) * grad
+                second = optimizer.beta2 * second + (1 - optimizer.beta2) * (grad ** 2)
+                m_hat = first / (1 - optimizer.beta1 ** t)
+                v_hat = second / (1 - optimizer.beta2 ** t)
+                w = w - (optimizer.learning_rate / (np.sqrt(v_hat) + optimizer.epsilon)) * m_hat
+    return w
+
+
+def test_batch_size_one_matches_reference(make_optimizer, iris):
+    X, y = iris
+    np.random.seed(42)
+    expected = reference_optimize(make_optimizer(), X, y, epochs=30)
+    np.random.seed(42)
+    w, costs = make_optimizer().optimize(X, y, epochs=30, batch_size=1)
+
+    np.testing.assert_array_equal(w, expected)
+    assert len(costs) == 30
+
+
+@pytest.mark.parametrize('batch_size', [1, 8])
+def test_optimize_many_matches_seeded_runs(make_optimizer, iris, batch_size):
+    X, y = iris
+    seeds = [1, 2, 3]
+    W, costs = make_optimizer().optimize_many(X, y, epochs=5, seeds=seeds, batch_size=batch_size)
+
+    assert W.shape == (X.shape[1], len(seeds))
+    assert costs.shape == (5, len(seeds))
+    for k, seed in enumerate(seeds):
+        w, run_costs = make_optimizer(seed=seed).optimize(X, y, epochs=5, batch_size=batch_size)
+        np.testing.assert_allclose(W[:, k], w, rtol=1e-12, atol=1e-14)
+        np.testing.assert_allclose(costs[:, k], run_costs, rtol=1e-12)
+
+
+@pytest.mark.parametrize('batch_size', [1, 8])
+def test_csr_matches_eager(make_optimizer, sparse_problem, batch_size):
+    X, y = sparse_problem
+    # Lazy Adam skips the drift of zero-gradient steps: CSR input must match
+    # the lazy dense updates, the other optimizers the eager ones
+    lazy = isinstance(make_optimizer(), Adam)
+    expected, expected_costs = make_optimizer(seed=3).optimize(X, y, epochs=3,
+                                                               batch_size=batch_size, lazy=lazy)
+    csr, csr_costs = make_optimizer(seed=3).optimize(sp.csr_matrix(X), y, epochs=3,
+                                                     batch_size=batch_size)
+
+    np.testing.assert_allclose(csr, expected, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(csr_costs, expected_costs, rtol=1e-12)
+
+
+@pytest.mark.parametrize('batch_size', [1, 8])
+def test_lazy_matches_eager(make_optimizer, sparse_problem, batch_size):
+    X, y = sparse_problem
+    eager, eager_costs = make_optimizer(seed=3).optimize(X, y, epochs=3, batch_size=batch_size)
+    lazy, lazy_costs = make_optimizer(seed=3).optimize(X, y, epochs=3, batch_size=batch_size,
+                                                       lazy=True)
+
+    if isinstance(make_optimizer(), Adam):
+        # Only the moments catch up exactly; the weights follow another path
+        assert np.all(np.diff(lazy_costs) < 0)
+        return
+    np.testing.assert_allclose(lazy, eager, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(lazy_costs, eager_costs, rtol=1e-12)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+@pytest.mark.parametrize('batch_size', [1, 8])
+def test_adam_exact_catch_up_matches_eager(sparse_problem, batch_size, sparse):
+    X, y = sparse_problem
+    eager, eager_costs = Adam(seed=3).optimize(X, y, epochs=3, batch_size=batch_size)
+    X_lazy = sp.csr_matrix(X) if sparse else X
+    lazy, lazy_costs = Adam(seed=3, exact_catch_up=True).optimize(
+        X_lazy, y, epochs=3, batch_size=batch_size, lazy=True)
+
+    np.testing.assert_allclose(lazy, eager, rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(lazy_costs, eager_costs, rtol=1e-12)
@@ -0,0 +1,20 @@
+"""
+The compiled per-sample epochs against the NumPy driver.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('numba')
+
+
+@pytest.mark.parametrize('cost_mode', ['full', 'running'])
+def test_numba_matches_numpy(make_optimizer, iris, cost_mode):
+    X, y = iris
+    expected, expected_costs = make_optimizer(seed=42).optimize(X, y, epochs=10,
+                                                                cost_mode=cost_mode)
+    w, costs = make_optimizer(seed=42, backend='numba').optimize(X, y, epochs=10,
+                                                                 cost_mode=cost_mode)
+
+    np.testing.assert_allclose(w, expected, rtol=1e-12, atol=1e-13)
+    np.testing.assert_allclose(costs, expected_costs, rtol=1e-12)
@@ -0,0 +1,18 @@
+"""
+Hyperparameter sweeps with the experiment settings.
+"""
+
+from experiment import GradientDescentExperiment
+
+
+def test_sweep_with_early_stopping(tmp_path):
+    experiment = GradientDescentExperiment(epochs=9, fit_params={'patience': 2})
+    experiment.prepare_data()
+    spaces = {'SGD': {'learning_rate': ('log', 1e-2, 5.0)}}
+    results = experiment.run_sweep(spaces, method='halving', max_epochs=9, n_configs=6,
+                                   cache_dir=str(tmp_path))
+
+    best = results['SGD']
+    assert best['epochs'] == 9
+    assert len(best['costs']) <= 9
+    assert experiment.optimizers['SGD'].learning_rate == best['params']['learning_rate']
@@ -0,0 +1,67 @@
+"""
+Stopping and resuming runs of ``BaseOptimizer.optimize``.
+"""
+
+import numpy as np
+
+
+def test_early_stop_records_final_cost(make_optimizer, iris):
+    X, y = iris
+    optimizer = make_optimizer(seed=0)
+    w, costs = optimizer.optimize(X, y, epochs=50, cost_mode='every', cost_every=7, tol=1e-1)
+
+    assert optimizer.stop_reason == 'tol'
+    assert optimizer.cost_epochs[-1] == optimizer.epochs_run
+    assert len(costs) == len(optimizer.cost_epochs)
+    np.testing.assert_allclose(costs[-1], optimizer.compute_cost(w, X, y))
+
+
+def test_resume_matches_uninterrupted_run(make_optimizer, iris, tmp_path):
+    X, y = iris
+    path = str(tmp_path / 'run.npz')
+    expected, expected_costs = make_optimizer(seed=7).optimize(X, y, epochs=10, batch_size=4)
+
+    make_optimizer(seed=7).optimize(X, y, epochs=4, batch_size=4, checkpoint_path=path)
+    w, costs = make_optimizer(seed=7).optimize(X, y, epochs=10, batch_size=4, resume_from=path)
+
+    np.testing.assert_array_equal(w, expected)
+    np.testing.assert_array_equal(costs, expected_costs)
+
+
+def test_patience_returns_best_weights_and_state(make_optimizer, iris):
+    X, y = iris
+    X_val, y_val = X[:20], y[:20]
+    optimizer = make_optimizer(seed=0, learning_rate=5.0)
+    w, costs = optimizer.optimize(X, y, epochs=60, cost_mode='every', cost_every=4,
+                                  X_val=X_val, y_val=y_val, patience=3)
+
+    assert optimizer.stop_reason == 'patience'
+    best = int(np.argmin(optimizer.val_costs)) + 1
+    assert optimizer.best_epoch == best
+    assert optimizer.cost_epochs[-1] == best
+    np.testing.assert_allclose(costs[-1], optimizer.compute_cost(w, X, y))
+
+    # The state belongs to the returned weights: retraining to the best
+    # epoch gives the same weights and buffers
+    rerun = make_optimizer(seed=0, learning_rate=5.0)
+    expected, _ = rerun.optimize(X, y, epochs=best)
+    np.testing.assert_array_equal(w, expected)
+    for key, value in rerun.state.items():
+        np.testing.assert_array_equal(optimizer.state[key], value)
+
+
+def test_resume_with_patience(make_optimizer, iris, tmp_path):
+    X, y = iris
+    X_val, y_val = X[:20], y[:20]
+    path = str(tmp_path / 'run.npz')
+    options = {'X_val': X_val, 'y_val': y_val, 'patience': 3}
+    expected, expected_costs = make_optimizer(seed=0, learning_rate=5.0).optimize(
+        X, y, epochs=60, **options)
+
+    make_optimizer(seed=0, learning_rate=5.0).optimize(X, y, epochs=3, checkpoint_path=path,
+                                                       **options)
+    w, costs = make_optimizer(seed=0, learning_rate=5.0).optimize(X, y, epochs=60,
+                                                                  resume_from=path, **options)
+
+    np.testing.assert_array_equal(w, expected)
+    np.testing.assert_array_equal(costs, expected_costs)